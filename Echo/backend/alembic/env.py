@@ -69,6 +69,17 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Reuse a connection handed in by the caller (see setup_db.py)
+    connection = config.attributes.get("connection", None)
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()
     connectable = engine_from_config(
@@ -8,21 +8,23 @@ These are the URLs your React frontend will call for habit management:
 - PUT /habits/{id} - Update a habit
 - DELETE /habits/{id} - Delete a habit
 - POST /habits/{id}/logs - Log habit completion
+- POST /habits/{id}/logs/bulk - Log several completions at once
 - GET /habits/{id}/logs - Get completion history
 - GET /habits/{id}/stats - Get habit statistics
 
 Think of these as the "buttons" for your habit tracking system!
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 
+from app.core.cache import analytics_etag, etag_matches
 from app.core.database import get_db
 from app.services.habit_service import HabitService
 from app.schemas.habit import (
     HabitCreate, HabitUpdate, HabitResponse, HabitWithLogs,
-    HabitLogCreate, HabitLogUpdate, HabitLogResponse,
+    HabitLogBase, HabitLogCreate, HabitLogUpdate, HabitLogResponse,
     HabitStatistics
 )
 from app.models.enums import HabitFrequency
@@ -319,6 +321,53 @@ def log_habit_completion(
         raise HTTPException(status_code=500, detail=f"Failed to log completion: {str(e)}")
 
 
+@router.post("/{habit_id}/logs/bulk", response_model=List[HabitLogResponse], status_code=201)
+def log_habit_completions(
+    habit_id: str,
+    logs_data: List[HabitLogBase],
+    db: Session = Depends(get_db)
+):
+    """
+    Log several habit completions in one request
+    
+    Useful for back-filling history: every entry is validated like a
+    single log, saved in one transaction, and streaks are updated once.
+    
+    Args:
+        habit_id: The unique identifier for the habit
+        logs_data: List of completions (completed_date, count, notes)
+        db: Database session (automatically injected)
+        
+    Returns:
+        List[HabitLogResponse]: The created/updated logs, oldest first
+        
+    Raises:
+        HTTPException 404: If habit is not found
+        
+    Example Request:
+        POST /habits/123e4567-e89b-12d3-a456-426614174000/logs/bulk
+        [
+            {"completed_date": "2024-01-09", "count": 1},
+            {"completed_date": "2024-01-10", "count": 1, "notes": "Great workout!"}
+        ]
+    """
+    try:
+        service = HabitService(db)
+        logs = service.log_habit_completions(
+            habit_id,
+            [HabitLogCreate(habit_id=habit_id, **log_data.model_dump()) for log_data in logs_data]
+        )
+        
+        if logs is None:
+            raise HTTPException(status_code=404, detail="Habit not found")
+        
+        return logs
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to log completions: {str(e)}")
+
+
 @router.get("/{habit_id}/logs", response_model=List[HabitLogResponse])
 def get_habit_logs(
     habit_id: str,
@@ -381,6 +430,8 @@ def get_habit_logs(
 @router.get("/{habit_id}/stats", response_model=HabitStatistics)
 def get_habit_statistics(
     habit_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
@@ -393,8 +444,12 @@ def get_habit_statistics(
     - Days since creation
     - Last completion date
     
+    Responses carry an ETag; sending it back in If-None-Match gets a
+    304 Not Modified until the habit data changes.
+    
     Args:
         habit_id: The unique identifier for the habit
+        if_none_match: ETag from an earlier response (optional)
         db: Database session (automatically injected)
         
     Returns:
@@ -420,11 +475,20 @@ def get_habit_statistics(
     """
     try:
         service = HabitService(db)
+        
+        # A deleted habit must answer 404, even to a client holding its ETag
+        etag = analytics_etag("habit_stats", habit_id)
+        if etag_matches(if_none_match, etag):
+            if not service.get_habit_by_id(habit_id):
+                raise HTTPException(status_code=404, detail="Habit not found")
+            return Response(status_code=304, headers={"ETag": etag})
+        
         stats = service.get_habit_statistics(habit_id)
         
         if not stats:
             raise HTTPException(status_code=404, detail="Habit not found")
         
+        response.headers["ETag"] = etag
         return stats
     except HTTPException:
         raise
@@ -433,7 +497,11 @@ def get_habit_statistics(
 
 
 @router.get("/stats/summary")
-def get_all_habits_statistics(db: Session = Depends(get_db)):
+def get_all_habits_statistics(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """
     Get overall statistics for all habits
     
@@ -443,6 +511,9 @@ def get_all_habits_statistics(db: Session = Depends(get_db)):
     - Total completions across all habits
     - Best current streak among all habits
     
+    Responses carry an ETag; sending it back in If-None-Match gets a
+    304 Not Modified until any habit data changes.
+    
     Returns:
         Dictionary with overall habit statistics
         
@@ -457,9 +528,14 @@ def get_all_habits_statistics(db: Session = Depends(get_db)):
             "best_current_streak": 12
         }
     """
+    etag = analytics_etag("habit_stats_summary")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
     try:
         service = HabitService(db)
         stats = service.get_all_habits_statistics()
+        response.headers["ETag"] = etag
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
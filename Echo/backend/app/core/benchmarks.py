@@ -4,10 +4,12 @@ Performance benchmarking utilities for ECHO AI Assistant
 This module provides tools to measure and analyze the performance of various
 components in the application, helping identify bottlenecks and optimization opportunities.
 """
+import math
 import time
 import statistics
 import logging
-from typing import Dict, List, Any, Callable, Optional
+from collections import deque
+from typing import Deque, Dict, List, Any, Callable, Optional
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
@@ -15,6 +17,9 @@ from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Recent samples kept per benchmark name for the median
+SAMPLE_WINDOW = 1000
+
 
 @dataclass
 class BenchmarkResult:
@@ -41,6 +46,58 @@ class BenchmarkSummary:
     total_time: float
 
 
+@dataclass
+class RunningStats:
+    """
+    Single-pass running statistics (Welford's algorithm)
+    
+    Mean, variance, min and max are updated per sample in O(1) memory;
+    only a bounded window of recent samples is kept, for the median.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of squared deviations from the mean
+    total_time: float = 0.0
+    min_time: float = math.inf
+    max_time: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_WINDOW))
+    
+    def update(self, value: float):
+        """Fold one sample into the statistics"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.total_time += value
+        self.min_time = min(self.min_time, value)
+        self.max_time = max(self.max_time, value)
+        self.samples.append(value)
+    
+    def update_many(self, values: List[float]):
+        """Fold several samples into the statistics, one at a time"""
+        for value in values:
+            self.update(value)
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation, as statistics.stdev computes it"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+    
+    def summarize(self, name: str) -> BenchmarkSummary:
+        """Summary statistics for this benchmark name"""
+        return BenchmarkSummary(
+            name=name,
+            total_runs=self.count,
+            avg_time=self.mean,
+            min_time=self.min_time,
+            max_time=self.max_time,
+            median_time=statistics.median(self.samples),
+            std_dev=self.stdev,
+            success_rate=100.0,  # Assume all recorded results are successful
+            total_time=self.total_time
+        )
+
+
 class PerformanceBenchmark:
     """
     Performance benchmarking utility for measuring execution times,
@@ -50,6 +107,25 @@ class PerformanceBenchmark:
     def __init__(self):
         self.results: List[BenchmarkResult] = []
         self.active_benchmarks: Dict[str, float] = {}
+        # Per-name totals, kept current so summaries never rescan results
+        self.stats: Dict[str, RunningStats] = {}
+    
+    def _store(self, result: BenchmarkResult, samples: Optional[List[float]] = None):
+        """
+        Keep a result and fold its timings into its name's running totals
+        
+        A result summarizing several iterations passes their individual
+        samples, so the per-name statistics count every iteration rather
+        than the one averaged result.
+        """
+        self.results.append(result)
+        
+        if result.name not in self.stats:
+            self.stats[result.name] = RunningStats()
+        if samples is None:
+            self.stats[result.name].update(result.execution_time)
+        else:
+            self.stats[result.name].update_many(samples)
     
     @contextmanager
     def measure(self, name: str, metadata: Optional[Dict[str, Any]] = None):
@@ -83,7 +159,7 @@ class PerformanceBenchmark:
                 metadata=metadata or {}
             )
             
-            self.results.append(result)
+            self._store(result)
             
             if execution_time > 1.0:  # Log slow operations
                 logger.warning(f"Slow operation: {name} took {execution_time:.3f}s")
@@ -108,31 +184,71 @@ class PerformanceBenchmark:
                 times = []
                 results = []
                 
-                for i in range(iterations):
-                    with self.measure(f"{benchmark_name}_iter_{i}"):
-                        result = func(*args, **kwargs)
-                        results.append(result)
-                        times.append(self.results[-1].execution_time)
+                # Plain perf_counter sampling; a measure() per iteration costs
+                # more than the sub-millisecond calls it would be timing
+                for _ in range(iterations):
+                    start_time = time.perf_counter()
+                    results.append(func(*args, **kwargs))
+                    times.append(time.perf_counter() - start_time)
                 
-                # Store summary result
-                summary_result = BenchmarkResult(
-                    name=benchmark_name,
-                    execution_time=statistics.mean(times),
-                    iterations=iterations,
-                    metadata={
-                        'min_time': min(times),
-                        'max_time': max(times),
-                        'std_dev': statistics.stdev(times) if len(times) > 1 else 0,
-                        'total_time': sum(times)
-                    }
-                )
-                self.results.append(summary_result)
+                # Store a single summary result
+                self.record_many(benchmark_name, times)
                 
                 return results[0] if iterations == 1 else results
             
             return wrapper
         return decorator
     
+    def record(self, name: str, execution_time: float, iterations: int = 1,
+               metadata: Optional[Dict[str, Any]] = None) -> BenchmarkResult:
+        """
+        Record an already-measured timing
+        
+        Use this for aggregate timings, e.g. one bulk operation covering many
+        rows, instead of wrapping every row in measure().
+        
+        Args:
+            name: Name of the benchmark
+            execution_time: Measured time in seconds
+            iterations: Number of operations the timing covers
+            metadata: Additional metadata to store with the result
+        """
+        result = BenchmarkResult(
+            name=name,
+            execution_time=execution_time,
+            iterations=iterations,
+            metadata=metadata or {}
+        )
+        
+        self._store(result)
+        return result
+    
+    def record_many(self, name: str, samples: List[float]) -> BenchmarkResult:
+        """
+        Record a batch of timing samples as one summary result
+        
+        The result's execution_time is the mean; every sample still counts
+        individually in get_summary() and get_slow_operations().
+        
+        Args:
+            name: Name of the benchmark
+            samples: Per-iteration times in seconds
+        """
+        result = BenchmarkResult(
+            name=name,
+            execution_time=statistics.fmean(samples),
+            iterations=len(samples),
+            metadata={
+                'min_time': min(samples),
+                'max_time': max(samples),
+                'std_dev': statistics.stdev(samples) if len(samples) > 1 else 0,
+                'total_time': sum(samples)
+            }
+        )
+        
+        self._store(result, samples)
+        return result
+    
     def start_benchmark(self, name: str):
         """Start a named benchmark (for manual timing)"""
         self.active_benchmarks[name] = time.perf_counter()
@@ -152,7 +268,7 @@ class PerformanceBenchmark:
             metadata=metadata or {}
         )
         
-        self.results.append(result)
+        self._store(result)
         return result
     
     def get_summary(self, name_pattern: Optional[str] = None) -> List[BenchmarkSummary]:
@@ -165,45 +281,31 @@ class PerformanceBenchmark:
         Returns:
             List of benchmark summaries
         """
-        # Group results by name
-        grouped_results: Dict[str, List[BenchmarkResult]] = {}
-        
-        for result in self.results:
-            if name_pattern and name_pattern not in result.name:
-                continue
-            
-            base_name = result.name.split('_iter_')[0]  # Remove iteration suffix
-            if base_name not in grouped_results:
-                grouped_results[base_name] = []
-            grouped_results[base_name].append(result)
-        
-        summaries = []
-        for name, results in grouped_results.items():
-            times = [r.execution_time for r in results]
-            
-            summary = BenchmarkSummary(
-                name=name,
-                total_runs=len(results),
-                avg_time=statistics.mean(times),
-                min_time=min(times),
-                max_time=max(times),
-                median_time=statistics.median(times),
-                std_dev=statistics.stdev(times) if len(times) > 1 else 0,
-                success_rate=100.0,  # Assume all recorded results are successful
-                total_time=sum(times)
-            )
-            summaries.append(summary)
+        summaries = [
+            stats.summarize(name)
+            for name, stats in self.stats.items()
+            if not name_pattern or name_pattern in name
+        ]
         
         return sorted(summaries, key=lambda x: x.avg_time, reverse=True)
     
     def get_slow_operations(self, threshold: float = 1.0) -> List[BenchmarkResult]:
-        """Get operations that took longer than the threshold"""
-        return [r for r in self.results if r.execution_time > threshold]
+        """
+        Get operations that took longer than the threshold
+        
+        A summary of several iterations counts as slow when its slowest
+        iteration was.
+        """
+        return [
+            r for r in self.results
+            if r.metadata.get('max_time', r.execution_time) > threshold
+        ]
     
     def clear_results(self):
         """Clear all benchmark results"""
         self.results.clear()
         self.active_benchmarks.clear()
+        self.stats.clear()
     
     def export_results(self, format: str = 'json') -> str:
         """Export benchmark results in the specified format"""
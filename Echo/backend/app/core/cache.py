@@ -1,15 +1,20 @@
 """
 Caching utilities for performance optimization
 """
+import copy
 import json
 import hashlib
 from typing import Any, Optional, Dict, Callable
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from functools import wraps
+from uuid import uuid4
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Distinguishes this process's analytics versions from a restarted server's
+_PROCESS_TOKEN = uuid4().hex
+
 
 class InMemoryCache:
     """
@@ -27,6 +32,7 @@ class InMemoryCache:
             default_ttl: Default time-to-live in seconds
         """
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
         self.default_ttl = default_ttl
     
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
@@ -43,6 +49,28 @@ class InMemoryCache:
         
         return f"{prefix}:{key_hash}"
     
+    def get_version(self, prefix: str) -> int:
+        """Current data version for a key prefix (part of every key under it)"""
+        return self._versions.get(prefix, 0)
+    
+    def bump_version(self, prefix: str) -> None:
+        """
+        Invalidate every entry under a prefix
+        
+        Keys embed the version, so bumping it makes old entries unreachable.
+        They are deleted here too: nothing would ever look them up again,
+        and nothing else removes them before the process exits.
+        """
+        old_version = self.get_version(prefix)
+        self._versions[prefix] = old_version + 1
+        
+        stale_prefix = f"{prefix}:v{old_version}:"
+        stale_keys = [key for key in self._cache if key.startswith(stale_prefix)]
+        for key in stale_keys:
+            del self._cache[key]
+        
+        logger.debug(f"Cache version bumped for prefix: {prefix}, dropped {len(stale_keys)} entries")
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired"""
         if key not in self._cache:
@@ -121,13 +149,14 @@ class InMemoryCache:
 cache = InMemoryCache(default_ttl=300)  # 5 minutes default
 
 
-def cached(ttl: int = 300, key_prefix: str = "default"):
+def cached(ttl: int = 300, key_prefix: str = "default", method: bool = False):
     """
     Decorator for caching function results
     
     Args:
         ttl: Time-to-live in seconds
         key_prefix: Prefix for cache keys
+        method: Leave `self` out of the key so every instance shares entries
         
     Example:
         @cached(ttl=600, key_prefix="analytics")
@@ -136,40 +165,89 @@ def cached(ttl: int = 300, key_prefix: str = "default"):
             return result
     """
     def decorator(func: Callable) -> Callable:
+        def make_key(*args, **kwargs) -> str:
+            key_args = args[1:] if method else args
+            versioned_prefix = f"{key_prefix}:v{cache.get_version(key_prefix)}"
+            return cache._generate_key(versioned_prefix, func.__name__, *key_args, **kwargs)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = cache._generate_key(key_prefix, func.__name__, *args, **kwargs)
+            cache_key = make_key(*args, **kwargs)
             
-            # Try to get from cache
+            # Try to get from cache. Entries are shared by every caller,
+            # so each one gets its own copy to mutate freely
             cached_result = cache.get(cache_key)
             if cached_result is not None:
-                return cached_result
+                return copy.deepcopy(cached_result)
             
-            # Execute function and cache result
+            # Execute function and cache a private copy of the result
             result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
+            cache.set(cache_key, copy.deepcopy(result), ttl)
             
             return result
         
         # Add cache management methods to the wrapped function
         wrapper.cache_clear = lambda: cache.clear()
-        wrapper.cache_delete = lambda *args, **kwargs: cache.delete(
-            cache._generate_key(key_prefix, func.__name__, *args, **kwargs)
-        )
+        wrapper.cache_delete = lambda *args, **kwargs: cache.delete(make_key(*args, **kwargs))
         
         return wrapper
     return decorator
 
 
-def cache_analytics_result(ttl: int = 600):
+def cache_analytics_result(ttl: int = 600, method: bool = False):
     """
     Specialized decorator for analytics caching
     
     Args:
         ttl: Time-to-live in seconds (default: 10 minutes)
+        method: Set for service methods so instances share entries
+    """
+    return cached(ttl=ttl, key_prefix="analytics", method=method)
+
+
+def invalidate_analytics_cache() -> None:
     """
-    return cached(ttl=ttl, key_prefix="analytics")
+    Drop all cached analytics results
+    
+    Called by the task and habit services after every write, so cached
+    dashboards never outlive the data they were computed from. The cache
+    and its version live in this process only, which holds because run.py
+    serves the app from a single uvicorn worker.
+    """
+    cache.bump_version("analytics")
+
+
+def analytics_etag(*parts: Any) -> str:
+    """
+    HTTP ETag for a response computed from analytics data
+    
+    The tag changes whenever invalidate_analytics_cache() runs, at midnight
+    (streaks and day counts depend on today's date) and on server restart,
+    so a client's If-None-Match can be answered without touching the database.
+    """
+    version = cache.get_version("analytics")
+    key_string = ":".join([_PROCESS_TOKEN, str(version), date.today().isoformat(), *map(str, parts)])
+    return '"' + hashlib.blake2b(key_string.encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag
+    
+    The header may list several tags or be "*"; tags are compared
+    weakly (a W/ prefix is ignored), as If-None-Match requires.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
 
 
 # Background task to cleanup expired entries
@@ -45,7 +45,7 @@ class AnalyticsService:
         """
         self.db = db
     
-    @cache_analytics_result(ttl=600)  # Cache for 10 minutes
+    @cache_analytics_result(ttl=600, method=True)  # Cache for 10 minutes
     def get_productivity_overview(
         self,
         start_date: Optional[date] = None,
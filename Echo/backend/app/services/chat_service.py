@@ -48,17 +48,23 @@ class ChatService:
         self.db = db
         self.task_service = TaskService(db)
         self.habit_service = HabitService(db)
+        # Context built for this request, reused by every later caller
+        self._user_context: Optional[Dict[str, Any]] = None
     
     def _build_user_context(self) -> Dict[str, Any]:
         """
         Build context about the user's current productivity state
         
         This gathers information about tasks, habits, and progress
-        to help ECHO give personalized advice.
+        to help ECHO give personalized advice. The service lives for
+        one request, so the context is built once and then reused.
         
         Returns:
             Dictionary with user's productivity context
         """
+        if self._user_context is not None:
+            return self._user_context
+        
         try:
             # Get task statistics
             task_stats = self.task_service.get_task_statistics()
@@ -133,6 +139,7 @@ class ChatService:
             }
             
             logger.info(f"Built user context with {task_stats['total']} tasks and {habit_stats['total_habits']} habits")
+            self._user_context = context
             return context
             
         except Exception as e:
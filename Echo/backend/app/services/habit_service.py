@@ -13,11 +13,12 @@ Think of this as your personal habit coach that tracks everything!
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc
 from typing import List, Optional, Dict
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 
 from app.models.habit import Habit, HabitLog
 from app.models.enums import HabitFrequency
 from app.schemas.habit import HabitCreate, HabitUpdate, HabitLogCreate, HabitLogUpdate
+from app.core.cache import invalidate_analytics_cache
 
 
 class HabitService:
@@ -69,6 +70,7 @@ class HabitService:
         self.db.add(db_habit)
         self.db.commit()
         self.db.refresh(db_habit)
+        invalidate_analytics_cache()  # Dashboards must see the new habit
         
         return db_habit
     
@@ -143,6 +145,7 @@ class HabitService:
         
         self.db.commit()
         self.db.refresh(db_habit)
+        invalidate_analytics_cache()
         
         return db_habit
     
@@ -166,6 +169,7 @@ class HabitService:
         # Delete the habit
         self.db.delete(db_habit)
         self.db.commit()
+        invalidate_analytics_cache()
         return True
     
     def log_habit_completion(self, log_data: HabitLogCreate) -> Optional[HabitLog]:
@@ -225,9 +229,77 @@ class HabitService:
         
         # Recalculate and update streaks
         self._update_habit_streaks(habit)
+        invalidate_analytics_cache()
         
         return log
     
+    def log_habit_completions(
+        self,
+        habit_id: str,
+        logs_data: List[HabitLogCreate]
+    ) -> Optional[List[HabitLog]]:
+        """
+        Log several completions for one habit in a single transaction
+        
+        Works like log_habit_completion for each entry (an existing log
+        for the same date is updated), but the habit is looked up once,
+        all changes are committed together and streaks are recalculated
+        only once at the end.
+        
+        Args:
+            habit_id: ID of the habit being logged
+            logs_data: HabitLogCreate entries; a repeated date keeps the last one
+            
+        Returns:
+            The created/updated logs ordered by date, None if habit not found
+        """
+        habit = self.get_habit_by_id(habit_id)
+        if not habit:
+            return None
+        
+        entries = {log_data.completed_date: log_data for log_data in logs_data}
+        if not entries:
+            return []
+        
+        # One query for every date that is already logged
+        existing_logs = {
+            log.completed_date: log
+            for log in self.db.query(HabitLog).filter(
+                and_(
+                    HabitLog.habit_id == habit_id,
+                    HabitLog.completed_date.in_(entries)
+                )
+            )
+        }
+        
+        new_logs = []
+        for completed_date, log_data in entries.items():
+            existing_log = existing_logs.get(completed_date)
+            if existing_log:
+                existing_log.count = log_data.count
+                existing_log.notes = log_data.notes
+            else:
+                new_logs.append(HabitLog(
+                    habit_id=habit_id,
+                    completed_date=completed_date,
+                    count=log_data.count,
+                    notes=log_data.notes
+                ))
+        
+        self.db.add_all(new_logs)
+        self.db.commit()
+        
+        # Recalculate and update streaks once for the whole batch
+        self._update_habit_streaks(habit)
+        invalidate_analytics_cache()
+        
+        return self.db.query(HabitLog).filter(
+            and_(
+                HabitLog.habit_id == habit_id,
+                HabitLog.completed_date.in_(entries)
+            )
+        ).order_by(HabitLog.completed_date).all()
+    
     def _update_habit_streaks(self, habit: Habit) -> None:
         """
         Calculate and update habit streaks
@@ -237,63 +309,45 @@ class HabitService:
         2. Longest streak (best streak ever achieved)
         
         Algorithm:
-        - Start from today and go backwards
-        - Count consecutive days with completions
-        - Stop when we find a gap
-        - Also find the longest streak in history
+        - Walk the distinct completion days in date order, once
+        - Consecutive days extend the running streak; a gap restarts it
+        - The longest run seen is the longest streak
+        - The run that reaches today is the current streak
         
         Args:
             habit: The habit to update streaks for
         """
-        # Get all completion logs for this habit, ordered by date
-        logs = self.db.query(HabitLog).filter(
-            HabitLog.habit_id == habit.id
-        ).order_by(HabitLog.completed_date.desc()).all()
-        
-        if not logs:
+        # Only the distinct completion days are needed, already sorted by the
+        # database, as day numbers so "consecutive" is a plain integer check
+        days = [
+            completed_date.toordinal()
+            for (completed_date,) in self.db.query(HabitLog.completed_date).filter(
+                HabitLog.habit_id == habit.id
+            ).distinct().order_by(HabitLog.completed_date)
+        ]
+        
+        if not days:
             # No completions yet
             habit.current_streak = 0
             habit.longest_streak = 0
             self.db.commit()
             return
         
-        # Calculate current streak (from today backwards)
+        today = date.today().toordinal()
         current_streak = 0
-        today = date.today()
-        current_date = today
-        
-        # Create a set of completion dates for fast lookup
-        completion_dates = {log.completed_date for log in logs}
-        
-        # Count backwards from today
-        while current_date in completion_dates:
-            current_streak += 1
-            current_date -= timedelta(days=1)
-        
-        # Calculate longest streak in history
         longest_streak = 0
-        temp_streak = 0
-        
-        # Sort all completion dates
-        all_dates = sorted(completion_dates)
-        
-        if all_dates:
-            temp_streak = 1  # First date counts as streak of 1
-            
-            for i in range(1, len(all_dates)):
-                prev_date = all_dates[i-1]
-                curr_date = all_dates[i]
-                
-                # Check if dates are consecutive
-                if (curr_date - prev_date).days == 1:
-                    temp_streak += 1
-                else:
-                    # Streak broken, check if it's the longest
-                    longest_streak = max(longest_streak, temp_streak)
-                    temp_streak = 1  # Start new streak
+        run = 0
+        previous_day = None
+        
+        for day in days:
+            # Consecutive days extend the run, a gap starts a new one
+            run = run + 1 if previous_day is not None and day == previous_day + 1 else 1
+            previous_day = day
+            longest_streak = max(longest_streak, run)
             
-            # Don't forget the last streak
-            longest_streak = max(longest_streak, temp_streak)
+            # The run reaching today is the current streak
+            if day == today:
+                current_streak = run
         
         # Update the habit
         habit.current_streak = current_streak
@@ -12,8 +12,10 @@ No monthly costs, just local compute power!
 import httpx
 import json
 import logging
-from typing import Optional, Dict, Any, AsyncGenerator, List
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, AsyncGenerator, AsyncIterator, List
 import asyncio
+import time
 from datetime import datetime
 
 from app.core.config import settings
@@ -33,14 +35,21 @@ class LocalAIClient:
     - And many more!
     """
     
-    def __init__(self, ollama_host: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        ollama_host: str = "http://localhost:11434",
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         """
         Initialize the local AI client
         
         Args:
             ollama_host: Ollama server URL (default: http://localhost:11434)
+            http_client: Optional shared AsyncClient to reuse pooled connections;
+                a short-lived client is created per call when omitted
         """
         self.ollama_host = ollama_host
+        self.http_client = http_client
         # Ultra-fast models for productivity tasks (ordered by speed)
         self.fast_models = [
             "llama3.2:1b",    # Meta's 1B model - very fast and widely available
@@ -51,8 +60,52 @@ class LocalAIClient:
         ]
         self.default_model = settings.LOCAL_AI_MODEL or "gemma2:2b"
         self.timeout = 30.0  # Reasonable timeout for reliability
+        # Short-lived /api/tags cache so back-to-back lookups share one request
+        self.tags_cache_ttl = 2.0
+        self._tags_cache: tuple = (0.0, None)
+        # Concurrent callers (e.g. an asyncio.gather of lookups) wait on the
+        # one in-flight fetch instead of each finding the cache empty
+        self._tags_lock = asyncio.Lock()
         logger.info(f"LocalAI client initialized with host: {ollama_host}, default model: {self.default_model}")
     
+    @asynccontextmanager
+    async def _http(self) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Yield the shared HTTP client if one was given, otherwise a fresh one
+        
+        Callers pass their own per-request timeout.
+        """
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+    
+    async def _tags(self, timeout: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch installed models from /api/tags, reusing a recent result
+        
+        Args:
+            timeout: Request timeout in seconds when the cache is stale
+            
+        Returns:
+            List of model dicts, or None if Ollama responded with an error
+        """
+        async with self._tags_lock:
+            now = time.monotonic()
+            cached_at, cached_models = self._tags_cache
+            if cached_models is not None and now - cached_at < self.tags_cache_ttl:
+                return cached_models
+            
+            async with self._http() as client:
+                response = await client.get(f"{self.ollama_host}/api/tags", timeout=timeout)
+                if response.status_code != 200:
+                    return None
+                models = response.json().get("models", [])
+            
+            self._tags_cache = (now, models)
+            return models
+    
     async def is_available(self) -> bool:
         """
         Check if Ollama server is available and has models
@@ -61,14 +114,12 @@ class LocalAIClient:
             bool: True if Ollama is running and has models
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                # Check if Ollama is running
-                response = await client.get(f"{self.ollama_host}/api/tags")
-                if response.status_code == 200:
-                    models = response.json().get("models", [])
-                    logger.info(f"Found {len(models)} available models")
-                    return len(models) > 0
-                return False
+            # Check if Ollama is running
+            models = await self._tags(timeout=5.0)
+            if models is not None:
+                logger.info(f"Found {len(models)} available models")
+                return len(models) > 0
+            return False
         except Exception as e:
             logger.warning(f"Ollama not available: {e}")
             return False
@@ -81,12 +132,10 @@ class LocalAIClient:
             List of model names
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.ollama_host}/api/tags")
-                if response.status_code == 200:
-                    models = response.json().get("models", [])
-                    return [model["name"] for model in models]
-                return []
+            models = await self._tags(timeout=10.0)
+            if models is not None:
+                return [model["name"] for model in models]
+            return []
         except Exception as e:
             logger.error(f"Error listing models: {e}")
             return []
@@ -131,12 +180,16 @@ class LocalAIClient:
         """
         try:
             logger.info(f"Pulling model: {model_name}")
-            async with httpx.AsyncClient(timeout=300.0) as client:  # 5 min timeout for downloads
+            async with self._http() as client:
                 response = await client.post(
                     f"{self.ollama_host}/api/pull",
-                    json={"name": model_name}
+                    json={"name": model_name},
+                    timeout=300.0  # 5 min timeout for downloads
                 )
-                return response.status_code == 200
+                if response.status_code == 200:
+                    self._tags_cache = (0.0, None)  # Installed models changed
+                    return True
+                return False
         except Exception as e:
             logger.error(f"Error pulling model {model_name}: {e}")
             return False
@@ -220,7 +273,7 @@ class LocalAIClient:
                 }
             }, indent=2)}")
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._http() as client:
                 response = await client.post(
                     f"{self.ollama_host}/api/generate",
                     json={
@@ -235,7 +288,8 @@ class LocalAIClient:
                             "repeat_penalty": 1.1,  # Reduce repetition
                             "num_ctx": 2048,    # Smaller context window for speed
                         }
-                    }
+                    },
+                    timeout=self.timeout
                 )
                 
                 logger.debug(f"Response status: {response.status_code}")
@@ -292,7 +346,7 @@ class LocalAIClient:
             
             logger.info(f"Starting streaming response with model: {model}")
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._http() as client:
                 async with client.stream(
                     "POST",
                     f"{self.ollama_host}/api/generate",
@@ -308,7 +362,8 @@ class LocalAIClient:
                             "repeat_penalty": 1.1,  # Reduce repetition
                             "num_ctx": 2048,    # Smaller context window for speed
                         }
-                    }
+                    },
+                    timeout=self.timeout
                 ) as response:
                     
                     if response.status_code == 200:
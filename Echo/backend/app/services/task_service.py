@@ -11,13 +11,15 @@ This is the "brain" of task management. It handles:
 Think of this as your personal assistant that knows how to manage tasks!
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import Row, and_, func, or_, select
 from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 
 from app.models.task import Task
 from app.models.enums import TaskStatus, TaskPriority
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.core.cache import invalidate_analytics_cache
 
 
 class TaskService:
@@ -70,6 +72,7 @@ class TaskService:
         self.db.add(db_task)           # Add to session
         self.db.commit()               # Save to database
         self.db.refresh(db_task)       # Get the ID and timestamps back
+        invalidate_analytics_cache()   # Dashboards must see the new task
         
         return db_task
     
@@ -90,7 +93,15 @@ class TaskService:
             else:
                 print("Task not found")
         """
-        return self.db.query(Task).filter(Task.id == task_id).first()
+        # Task IDs are always UUIDs, so anything else can't match a row
+        try:
+            UUID(task_id)
+        except (TypeError, ValueError):
+            return None
+        
+        # Session.get answers from the identity map when this session has
+        # already loaded the task (e.g. update_task right after a lookup)
+        return self.db.get(Task, task_id)
     
     def get_all_tasks(
         self, 
@@ -131,8 +142,41 @@ class TaskService:
             # Get first 10 tasks (pagination)
             first_page = service.get_all_tasks(limit=10, offset=0)
         """
-        query = self.db.query(Task)
+        query = self._filter_tasks(
+            self.db.query(Task), status, priority, limit, offset, search
+        )
+        return query.all()
+    
+    def get_all_tasks_lite(
+        self,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        limit: int = 100,
+        offset: int = 0,
+        search: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Get the same tasks as get_all_tasks, as plain rows
+        
+        Only id, title, status and priority are loaded, and the rows are
+        not tracked by the session, so this is much cheaper when the
+        caller just needs to count or list tasks.
         
+        Returns:
+            Rows with id, title, status and priority attributes
+            
+        Example:
+            todo = service.get_all_tasks_lite(status=TaskStatus.TODO)
+            print([row.title for row in todo])
+        """
+        statement = self._filter_tasks(
+            select(Task.id, Task.title, Task.status, Task.priority),
+            status, priority, limit, offset, search
+        )
+        return self.db.execute(statement).all()
+    
+    def _filter_tasks(self, query, status, priority, limit, offset, search):
+        """Apply get_all_tasks' filters, ordering and pagination to a query or select()"""
         # Apply filters if provided
         if status:
             query = query.filter(Task.status == status)
@@ -152,9 +196,7 @@ class TaskService:
         
         # Apply pagination and ordering (use index-friendly ordering)
         query = query.order_by(Task.created_at.desc())  # Newest first
-        query = query.offset(offset).limit(limit)
-        
-        return query.all()
+        return query.offset(offset).limit(limit)
     
     def update_task(self, task_id: str, task_update: TaskUpdate) -> Optional[Task]:
         """
@@ -198,6 +240,7 @@ class TaskService:
         # Save changes
         self.db.commit()
         self.db.refresh(db_task)
+        invalidate_analytics_cache()
         
         return db_task
     
@@ -224,6 +267,7 @@ class TaskService:
         
         self.db.delete(db_task)
         self.db.commit()
+        invalidate_analytics_cache()
         return True
     
     def get_task_statistics(self) -> dict:
@@ -243,23 +287,26 @@ class TaskService:
             print(f"Total tasks: {stats['total']}")
             print(f"Completed: {stats['completed']}")
         """
-        total_tasks = self.db.query(Task).count()
-        completed_tasks = self.db.query(Task).filter(Task.status == TaskStatus.COMPLETED).count()
-        pending_tasks = total_tasks - completed_tasks
-        
-        # Count overdue tasks (due_date is in the past and not completed)
+        # One aggregate query counts everything in a single table scan;
+        # overdue means due_date is in the past and not completed
         now = datetime.now()
-        overdue_tasks = self.db.query(Task).filter(
-            and_(
-                Task.due_date < now,
-                Task.status != TaskStatus.COMPLETED
-            )
-        ).count()
+        total_tasks, completed_tasks, overdue_tasks = self.db.execute(
+            select(
+                func.count(),
+                func.count().filter(Task.status == TaskStatus.COMPLETED),
+                func.count().filter(
+                    and_(
+                        Task.due_date < now,
+                        Task.status != TaskStatus.COMPLETED
+                    )
+                )
+            ).select_from(Task)
+        ).one()
         
         return {
             "total": total_tasks,
             "completed": completed_tasks,
-            "pending": pending_tasks,
+            "pending": total_tasks - completed_tasks,
             "overdue": overdue_tasks
         }
 
@@ -12,11 +12,6 @@ Run this to find your optimal model!
 """
 import asyncio
 import time
-import sys
-from pathlib import Path
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent))
 
 from app.services.local_ai_client import LocalAIClient
 
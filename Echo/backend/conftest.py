@@ -0,0 +1,159 @@
+"""
+Shared pytest fixtures for the API smoke scripts
+
+The test_*_api.py scripts normally talk to a server started with
+`python run.py`. Under pytest they are served in-process by the FastAPI
+app instead, backed by a throwaway SQLite database, so no live server
+(and no network round trip) is needed.
+"""
+import asyncio
+import inspect
+import io
+
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+SERVER_URL = "http://localhost:8000"
+
+
+class ASGIAdapter(BaseAdapter):
+    """
+    requests transport adapter that answers from the in-process app
+
+    Mounted on a script's SESSION so its requests.get/post calls (timeouts,
+    exceptions, response objects) behave exactly as against a live server.
+    """
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        reply = self.client.request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            content=request.body,
+        )
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response.encoding = reply.encoding
+        response.reason = reply.reason_phrase
+        response.url = request.url
+        response.request = request
+        # raw backs stream=True reads (iter_lines/iter_content) and close()
+        response.raw = io.BytesIO(reply.content)
+        response._content = reply.content
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def session_factory(tmp_path_factory):
+    """
+    Session factory for a fresh SQLite database shared by this test session
+    """
+    from app.models import Base
+
+    db_path = tmp_path_factory.mktemp("api") / "echo_api.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def db_session(session_factory):
+    """
+    One database session shared by the service-level smoke scripts
+    """
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def api_app(session_factory):
+    """
+    The FastAPI app wired to the test session's SQLite database
+    """
+    from app.core.database import get_db
+    from app.main import app
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield app
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def api_client(api_app):
+    """
+    In-process client for the app, addressed as the live server would be
+    """
+    from fastapi.testclient import TestClient
+
+    with TestClient(api_app, base_url=SERVER_URL) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def in_process_api(request, monkeypatch):
+    """
+    Point a smoke script's HTTP client at the in-process app
+
+    Scripts built on requests expose a module-level SESSION; the httpx-based
+    ones expose a module-level TRANSPORT. Other test modules are untouched.
+    """
+    module = request.module
+    if isinstance(getattr(module, "SESSION", None), requests.Session):
+        client = request.getfixturevalue("api_client")
+        module.SESSION.mount(SERVER_URL, ASGIAdapter(client))
+        yield
+        module.SESSION.adapters.pop(SERVER_URL, None)
+    elif hasattr(module, "TRANSPORT"):
+        app = request.getfixturevalue("api_app")
+        monkeypatch.setattr(module, "TRANSPORT", httpx.ASGITransport(app=app))
+        yield
+    else:
+        yield
+
+
+@pytest.fixture
+def api_session(request):
+    """
+    The calling script's requests SESSION, already routed to the app
+    """
+    return request.module.SESSION
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """
+    Run async smoke scripts (e.g. test_events_api) on a fresh event loop
+    """
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    argnames = pyfuncitem._fixtureinfo.argnames
+    asyncio.run(pyfuncitem.obj(**{name: pyfuncitem.funcargs[name] for name in argnames}))
+    return True
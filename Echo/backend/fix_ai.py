@@ -11,11 +11,6 @@ Run this if ECHO is not responding with AI-like responses.
 """
 import asyncio
 import subprocess
-import sys
-from pathlib import Path
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent))
 
 from app.services.local_ai_client import LocalAIClient
 
@@ -105,5 +100,10 @@ async def main():
         print("3. A model is installed: ollama pull llama3.2:1b")
 
 
+def main_sync():
+    """Run the async main() from a synchronous entry point"""
+    asyncio.run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main_sync()
\ No newline at end of file
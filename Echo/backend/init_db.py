@@ -2,12 +2,6 @@
 """
 Initialize the database with tables and sample data
 """
-import sys
-import os
-
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from app.core.database import engine, Base
 from app.models import Task, Habit  # Import all your models
 
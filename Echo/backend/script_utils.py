@@ -0,0 +1,26 @@
+"""
+Shared helpers for the API test scripts
+
+Used by test_task_api.py, test_chat_api.py and test_events_api.py.
+"""
+import io
+import orjson
+import sys
+from contextlib import contextmanager, redirect_stdout
+
+
+@contextmanager
+def buffered_stdout():
+    """Collect print() output in memory and write it to stdout in one call"""
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            yield
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+def parse_json(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
@@ -8,11 +8,6 @@ works for everyone - even friends who don't have Ollama installed!
 Perfect for sharing your ECHO deployment! 🌐
 """
 import asyncio
-import sys
-from pathlib import Path
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent))
 
 from app.services.cloud_ai_client import CloudAIClient
 
@@ -121,5 +116,10 @@ async def main():
         print("Then run this script again to test!")
 
 
+def main_sync():
+    """Run the async main() from a synchronous entry point"""
+    asyncio.run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main_sync()
\ No newline at end of file
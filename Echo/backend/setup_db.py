@@ -1,43 +1,62 @@
 """
 Database setup script
 """
-import os
 import sys
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import create_engine, text
 from app.core.config import settings
+from app.core.database import engine
 
-def create_database():
+def create_database(conn):
     """Create the database if it doesn't exist"""
-    # Connect to PostgreSQL server (not specific database)
-    server_url = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/postgres"
-    
     try:
-        engine = create_engine(server_url)
-        with engine.connect() as conn:
-            # Check if database exists
-            result = conn.execute(text(f"SELECT 1 FROM pg_database WHERE datname = '{settings.POSTGRES_DB}'"))
-            if not result.fetchone():
-                # Create database
-                conn.execute(text("COMMIT"))  # End any existing transaction
-                conn.execute(text(f"CREATE DATABASE {settings.POSTGRES_DB}"))
-                print(f"Database '{settings.POSTGRES_DB}' created successfully!")
-            else:
-                print(f"Database '{settings.POSTGRES_DB}' already exists.")
+        # Check if database exists
+        result = conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": settings.POSTGRES_DB},
+        )
+        if not result.fetchone():
+            # CREATE DATABASE cannot run inside a transaction; conn is AUTOCOMMIT
+            conn.execute(text(f"CREATE DATABASE {settings.POSTGRES_DB}"))
+            print(f"Database '{settings.POSTGRES_DB}' created successfully!")
+        else:
+            print(f"Database '{settings.POSTGRES_DB}' already exists.")
     except Exception as e:
         print(f"Error creating database: {e}")
         sys.exit(1)
 
-def run_migrations():
-    """Run Alembic migrations"""
+def run_migrations(conn):
+    """Run Alembic migrations in-process on an existing connection"""
     try:
-        os.system("alembic upgrade head")
+        alembic_cfg = Config("alembic.ini")
+        # alembic/env.py picks this connection up instead of opening its own engine
+        alembic_cfg.attributes["connection"] = conn
+        command.upgrade(alembic_cfg, "head")
         print("Database migrations completed successfully!")
     except Exception as e:
         print(f"Error running migrations: {e}")
         sys.exit(1)
 
+def main():
+    """Create the database, then migrate it using the application's engine"""
+    # Connect to PostgreSQL server (not specific database)
+    server_url = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/postgres"
+    server_engine = create_engine(server_url, isolation_level="AUTOCOMMIT")
+    try:
+        with server_engine.connect() as conn:
+            create_database(conn)
+    except Exception as e:
+        print(f"Error connecting to database server: {e}")
+        sys.exit(1)
+    finally:
+        server_engine.dispose()
+
+    # Reuse the pooled application engine for the migration phase
+    with engine.begin() as conn:
+        run_migrations(conn)
+
 if __name__ == "__main__":
     print("Setting up ECHO database...")
-    create_database()
-    run_migrations()
+    main()
     print("Database setup completed!")
\ No newline at end of file
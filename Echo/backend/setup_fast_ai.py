@@ -11,17 +11,38 @@ It will:
 Run this script to get ECHO running with lightning-fast, free AI!
 """
 import asyncio
+import logging
+import logging.handlers
 import sys
 import subprocess
 import platform
-from pathlib import Path
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent))
 
 from app.services.local_ai_client import LocalAIClient
 
 
+class BatchedStdoutHandler(logging.handlers.BufferingHandler):
+    """Buffer progress records and write them to stdout in a single call per flush"""
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                sys.stdout.write("".join(self.format(record) + "\n" for record in self.buffer))
+                sys.stdout.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+# Progress lines from the model pull loop are batched instead of printed one by one
+progress_handler = BatchedStdoutHandler(capacity=32)
+progress_handler.setFormatter(logging.Formatter("%(message)s"))
+logger = logging.getLogger("echo.setup")
+logger.setLevel(logging.INFO)
+logger.addHandler(progress_handler)
+logger.propagate = False
+
+
 async def check_ollama_installed():
     """Check if Ollama is installed"""
     try:
@@ -94,14 +115,16 @@ async def setup_fast_models():
     
     for model_name, description in fast_models:
         if model_name not in models:
-            print(f"\n📥 Installing {model_name} ({description})...")
+            logger.info(f"\n📥 Installing {model_name} ({description})...")
+            progress_handler.flush()
             success = await client.pull_model(model_name)
             if success:
-                print(f"✅ Successfully installed {model_name}")
+                logger.info(f"✅ Successfully installed {model_name}")
             else:
-                print(f"❌ Failed to install {model_name}")
+                logger.info(f"❌ Failed to install {model_name}")
         else:
-            print(f"✅ {model_name} already installed")
+            logger.info(f"✅ {model_name} already installed")
+        progress_handler.flush()
     
     return True
 
@@ -167,5 +190,10 @@ async def main():
         print("\n❌ Setup incomplete. Please check the errors above.")
 
 
+def main_sync():
+    """Run the async main() from a synchronous entry point"""
+    asyncio.run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main_sync()
\ No newline at end of file
@@ -11,12 +11,37 @@ It will:
 
 Run this after installing Ollama from https://ollama.ai/
 """
+import atexit
+import codecs
+import re
 import subprocess
 import sys
+import threading
 import time
 import requests
-import json
-from typing import List, Tuple
+import orjson
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import List, Optional, Tuple
+
+
+# One keep-alive session for every call to the local Ollama server
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0))
+SESSION.headers.update({
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "echo-setup/1.0",
+})
+atexit.register(SESSION.close)
+
+# /api/tags results are reused for a few seconds within one run
+TAGS_CACHE_TTL = 5.0
+_tags_cache = {"ts": 0.0, "val": None}
+
+# Model pulls and tests run on worker threads; keep their output lines whole
+PRINT_LOCK = threading.Lock()
 
 
 class Colors:
@@ -29,30 +54,47 @@ class Colors:
     END = '\033[0m'
 
 
+# Skip escape codes entirely when output is piped to a file
+if not sys.stdout.isatty():
+    for _name in ("GREEN", "YELLOW", "RED", "BLUE", "BOLD", "END"):
+        setattr(Colors, _name, "")
+
+# Message prefixes for the print helpers, built once at import
+STEP_PREFIX = f"\n{Colors.BLUE}🔧 "
+SUCCESS_PREFIX = f"{Colors.GREEN}✅ "
+WARNING_PREFIX = f"{Colors.YELLOW}⚠️  "
+ERROR_PREFIX = f"{Colors.RED}❌ "
+
+def locked_print(*args, **kwargs):
+    """Print while holding PRINT_LOCK so concurrent workers don't interleave"""
+    with PRINT_LOCK:
+        print(*args, **kwargs)
+
+
 def print_step(message: str):
     """Print a step with formatting"""
-    print(f"\n{Colors.BLUE}🔧 {message}{Colors.END}")
+    locked_print(STEP_PREFIX + message + Colors.END)
 
 
 def print_success(message: str):
     """Print success message"""
-    print(f"{Colors.GREEN}✅ {message}{Colors.END}")
+    locked_print(SUCCESS_PREFIX + message + Colors.END)
 
 
 def print_warning(message: str):
     """Print warning message"""
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.END}")
+    locked_print(WARNING_PREFIX + message + Colors.END)
 
 
 def print_error(message: str):
     """Print error message"""
-    print(f"{Colors.RED}❌ {message}{Colors.END}")
+    locked_print(ERROR_PREFIX + message + Colors.END)
 
 
-def run_command(command: List[str]) -> Tuple[bool, str]:
+def run_command(command: List[str], timeout: float = 300) -> Tuple[bool, str]:
     """Run a command and return success status and output"""
     try:
-        result = subprocess.run(command, capture_output=True, text=True, timeout=300)
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
         return result.returncode == 0, result.stdout + result.stderr
     except subprocess.TimeoutExpired:
         return False, "Command timed out"
@@ -60,10 +102,87 @@ def run_command(command: List[str]) -> Tuple[bool, str]:
         return False, str(e)
 
 
+# Line endings in a command's output; a lone \r (a progress-bar redraw)
+# only counts once the next character shows it isn't half of \r\n
+_LINE_BREAK = re.compile(r"(\r\n|\r(?=.)|\n)", re.S)
+
+
+def run_streaming(command: List[str], prefix: str = "", timeout: float = 300,
+                  refresh_interval: float = 5.0) -> Tuple[bool, str]:
+    """Run a long command, echoing its output as it arrives
+    
+    Progress bars redraw themselves with carriage returns; those redraws
+    are shown at most once per refresh_interval instead of as a new line
+    each. The command is killed if it is still running after timeout
+    seconds.
+    
+    Returns success status and the last line of output.
+    """
+    last_line = ""
+    shown_line = ""
+    last_shown = 0.0
+    timed_out = threading.Event()
+    
+    def show(line: str):
+        nonlocal shown_line, last_shown
+        locked_print(f"{prefix}{line}")
+        shown_line, last_shown = line, time.monotonic()
+    
+    def kill(proc):
+        timed_out.set()
+        proc.kill()
+    
+    try:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+            watchdog = threading.Timer(timeout, kill, args=(proc,))
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                pending = ""
+                for chunk in iter(lambda: proc.stdout.read1(4096), b""):
+                    pending += decoder.decode(chunk)
+                    # [text, separator, text, separator, ..., unfinished rest]
+                    parts = _LINE_BREAK.split(pending)
+                    pending = parts.pop()
+                    for text, separator in zip(parts[::2], parts[1::2]):
+                        line = text.strip()
+                        if not line:
+                            # A bar ending its line: show where it stopped
+                            if separator != "\r" and last_line != shown_line:
+                                show(last_line)
+                            continue
+                        last_line = line
+                        if separator != "\r" or time.monotonic() - last_shown >= refresh_interval:
+                            show(line)
+                
+                pending = (pending + decoder.decode(b"", final=True)).strip()
+                if pending:
+                    last_line = pending
+                if last_line and last_line != shown_line:
+                    show(last_line)  # The final state of a progress bar
+                
+                returncode = proc.wait()
+            finally:
+                watchdog.cancel()
+        
+        if timed_out.is_set():
+            return False, f"Command timed out after {timeout:.0f}s"
+        return returncode == 0, last_line
+    except Exception as e:
+        return False, str(e)
+
+
 def check_ollama_installed() -> bool:
     """Check if Ollama is installed"""
     print_step("Checking if Ollama is installed...")
-    success, output = run_command(["ollama", "--version"])
+    # A PATH lookup is enough to rule Ollama out without spawning a process
+    if shutil.which("ollama") is None:
+        print_error("Ollama is not installed or not in PATH")
+        print(f"{Colors.YELLOW}Please install Ollama from: https://ollama.ai/{Colors.END}")
+        return False
+    
+    success, output = run_command(["ollama", "--version"], timeout=5)
     
     if success:
         print_success(f"Ollama is installed: {output.strip()}")
@@ -74,46 +193,73 @@ def check_ollama_installed() -> bool:
         return False
 
 
+def _wait_for_ollama(timeout_s: float) -> bool:
+    """Poll /api/tags until the server answers or timeout_s elapses
+    
+    A successful response also primes the model list cache.
+    """
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            response = SESSION.get("http://localhost:11434/api/tags", timeout=min(timeout_s, 0.5))
+            if response.status_code == 200:
+                models = orjson.loads(response.content).get("models", [])
+                _tags_cache.update(ts=time.monotonic(), val=[model["name"] for model in models])
+                return True
+        except requests.RequestException:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+
+
 def check_ollama_running() -> bool:
     """Check if Ollama server is running"""
     print_step("Checking if Ollama server is running...")
+    if _wait_for_ollama(timeout_s=0.5):
+        print_success("Ollama server is running")
+        return True
+    
+    print_warning("Ollama server is not running")
+    print(f"{Colors.YELLOW}Starting Ollama server...{Colors.END}")
+    
+    # Try to start Ollama
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        if response.status_code == 200:
-            print_success("Ollama server is running")
-            return True
-        else:
-            print_warning("Ollama server responded with error")
-            return False
-    except requests.RequestException:
-        print_warning("Ollama server is not running")
-        print(f"{Colors.YELLOW}Starting Ollama server...{Colors.END}")
-        
-        # Try to start Ollama
-        try:
-            subprocess.Popen(["ollama", "serve"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(3)  # Wait for server to start
-            
-            # Check again
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
-            if response.status_code == 200:
-                print_success("Ollama server started successfully")
-                return True
-        except Exception as e:
-            print_error(f"Failed to start Ollama server: {e}")
-        
+        subprocess.Popen(["ollama", "serve"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception as e:
+        print_error(f"Failed to start Ollama server: {e}")
         return False
+    
+    if _wait_for_ollama(timeout_s=15):
+        print_success("Ollama server started successfully")
+        return True
+    
+    print_error("Ollama server did not become ready within 15 seconds")
+    return False
+
+
+def fetch_model_names() -> Optional[List[str]]:
+    """Return installed model names from /api/tags, or None if the request failed"""
+    now = time.monotonic()
+    if _tags_cache["val"] is not None and now - _tags_cache["ts"] < TAGS_CACHE_TTL:
+        return _tags_cache["val"]
+    
+    response = SESSION.get("http://localhost:11434/api/tags", timeout=10)
+    if response.status_code != 200:
+        return None
+    
+    models = orjson.loads(response.content).get("models", [])
+    model_names = [model["name"] for model in models]
+    _tags_cache.update(ts=now, val=model_names)
+    return model_names
 
 
 def list_available_models() -> List[str]:
     """List currently available models"""
     print_step("Checking available models...")
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=10)
-        if response.status_code == 200:
-            models = response.json().get("models", [])
-            model_names = [model["name"] for model in models]
-            
+        model_names = fetch_model_names()
+        if model_names is not None:
             if model_names:
                 print_success(f"Found {len(model_names)} models:")
                 for model in model_names:
@@ -133,11 +279,12 @@ def list_available_models() -> List[str]:
 def pull_model(model_name: str) -> bool:
     """Pull/download a model"""
     print_step(f"Pulling model: {model_name}")
-    print(f"{Colors.YELLOW}This may take several minutes depending on model size...{Colors.END}")
+    locked_print(f"{Colors.YELLOW}This may take several minutes depending on model size...{Colors.END}")
     
-    success, output = run_command(["ollama", "pull", model_name])
+    success, output = run_streaming(["ollama", "pull", model_name], prefix=f"  [{model_name}] ")
     
     if success:
+        _tags_cache["val"] = None  # Installed models changed
         print_success(f"Successfully pulled {model_name}")
         return True
     else:
@@ -150,18 +297,21 @@ def test_model(model_name: str) -> bool:
     print_step(f"Testing model: {model_name}")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:11434/api/generate",
             json={
                 "model": model_name,
                 "prompt": "Hello! Please respond with just 'AI test successful' and nothing else.",
-                "stream": False
+                "stream": False,
+                # Keep the model loaded for the backend and stop after a short reply
+                "keep_alive": "5m",
+                "options": {"num_predict": 16}
             },
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             ai_response = result.get("response", "").strip()
             print_success(f"Model test successful: {ai_response[:50]}...")
             return True
@@ -228,17 +378,23 @@ def main():
         print_error("Invalid choice")
         sys.exit(1)
     
-    # Install selected models
-    for model in models_to_install:
-        if model not in current_models:
-            if not pull_model(model):
-                print_error(f"Failed to install {model}")
-                continue
-        else:
+    # Install selected models; pulls for different models are independent
+    def install_model(model: str) -> bool:
+        if model in current_models:
             print_success(f"{model} already installed")
-        
-        # Test the model
-        test_model(model)
+            return True
+        if not pull_model(model):
+            print_error(f"Failed to install {model}")
+            return False
+        return True
+    
+    if models_to_install:
+        with ThreadPoolExecutor(max_workers=min(3, len(models_to_install))) as executor:
+            installed = list(executor.map(install_model, models_to_install))
+            
+            # Test the models that installed successfully
+            ready_models = [model for model, ok in zip(models_to_install, installed) if ok]
+            list(executor.map(test_model, ready_models))
     
     # Final setup verification
     print_step("Final setup verification...")
@@ -6,12 +6,27 @@ Easily switch between local AI (development) and cloud AI (deployment) modes.
 """
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-
-def read_env_file():
-    """Read current .env file"""
-    env_path = Path(__file__).parent / ".env"
+# Layout of the generated .env file: (comment header, keys) per section
+ENV_SECTIONS = (
+    ("# Database Configuration\n# Using PostgreSQL for production-ready database management",
+     ("USE_SQLITE",)),
+    ("# PostgreSQL settings",
+     ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB", "POSTGRES_PORT")),
+    ("# AI Configuration\n# Local AI (Ollama) - Free and Private for development",
+     ("USE_LOCAL_AI", "OLLAMA_HOST", "LOCAL_AI_MODEL")),
+    ("# Cloud AI - Free APIs for deployed apps (so friends can use ECHO!)",
+     ("USE_CLOUD_AI", "GROQ_API_KEY", "HUGGINGFACE_API_KEY", "OPENROUTER_API_KEY")),
+    ("# Google Calendar API",
+     ("GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET")),
+)
+
+
+@lru_cache(maxsize=4)
+def _parse_env_file(env_path: Path):
+    """Parse a .env file once per path; write_env_file clears this cache"""
     if not env_path.exists():
         return {}
     
@@ -20,46 +35,35 @@ def read_env_file():
         for line in f:
             line = line.strip()
             if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
+                key, _, value = line.partition('=')
                 env_vars[key] = value
     return env_vars
 
 
+def read_env_file():
+    """Read current .env file"""
+    env_path = Path(__file__).parent / ".env"
+    # Callers modify the result, so hand out a copy of the cached dict
+    return dict(_parse_env_file(env_path))
+
+
 def write_env_file(env_vars):
     """Write updated .env file"""
     env_path = Path(__file__).parent / ".env"
     
-    # Template with comments
-    template = """# Database Configuration
-# Using PostgreSQL for production-ready database management
-USE_SQLITE={USE_SQLITE}
-
-# PostgreSQL settings
-POSTGRES_SERVER={POSTGRES_SERVER}
-POSTGRES_USER={POSTGRES_USER}
-POSTGRES_PASSWORD={POSTGRES_PASSWORD}
-POSTGRES_DB={POSTGRES_DB}
-POSTGRES_PORT={POSTGRES_PORT}
-
-# AI Configuration
-# Local AI (Ollama) - Free and Private for development
-USE_LOCAL_AI={USE_LOCAL_AI}
-OLLAMA_HOST={OLLAMA_HOST}
-LOCAL_AI_MODEL={LOCAL_AI_MODEL}
-
-# Cloud AI - Free APIs for deployed apps (so friends can use ECHO!)
-USE_CLOUD_AI={USE_CLOUD_AI}
-GROQ_API_KEY={GROQ_API_KEY}
-HUGGINGFACE_API_KEY={HUGGINGFACE_API_KEY}
-OPENROUTER_API_KEY={OPENROUTER_API_KEY}
-
-# Google Calendar API
-GOOGLE_CLIENT_ID={GOOGLE_CLIENT_ID}
-GOOGLE_CLIENT_SECRET={GOOGLE_CLIENT_SECRET}
-"""
+    blocks = []
+    for header, keys in ENV_SECTIONS:
+        lines = [header] + [f"{key}={env_vars.get(key, '')}" for key in keys]
+        blocks.append("\n".join(lines))
+    
+    # Keep any settings the layout doesn't know about (e.g. SECRET_KEY)
+    known_keys = {key for _, keys in ENV_SECTIONS for key in keys}
+    extra = [f"{key}={value}" for key, value in env_vars.items() if key not in known_keys]
+    if extra:
+        blocks.append("\n".join(["# Other settings"] + extra))
     
-    with open(env_path, 'w') as f:
-        f.write(template.format(**env_vars))
+    env_path.write_text("\n\n".join(blocks) + "\n")
+    _parse_env_file.cache_clear()
 
 
 def switch_to_local():
@@ -5,26 +5,36 @@ Quick AI Test - Diagnose ECHO AI Issues
 This script quickly tests if ECHO's AI is working and provides diagnostics.
 """
 import asyncio
-import sys
-from pathlib import Path
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent))
+import httpx
 
 from app.services.local_ai_client import LocalAIClient
 
+# One small keep-alive pool shared by the diagnostic's few requests
+HTTP_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+
 
 async def quick_test():
     """Quick test of AI functionality"""
     print("🔍 ECHO AI Quick Diagnostic")
     print("=" * 40)
     
-    client = LocalAIClient()
+    async with httpx.AsyncClient(limits=HTTP_LIMITS) as http_client:
+        await run_diagnostics(LocalAIClient(http_client=http_client))
+
+
+async def run_diagnostics(client: LocalAIClient):
+    """Run the diagnostic steps using the given client"""
+    # Tests 1-3 are independent read-only probes, so run them concurrently
+    is_available, models, fastest = await asyncio.gather(
+        client.is_available(),
+        client.list_models(),
+        client.get_fastest_available_model(),
+        return_exceptions=True,
+    )
     
     # Test 1: Check if Ollama is running
     print("1. Checking Ollama server...")
-    is_available = await client.is_available()
-    if is_available:
+    if is_available is True:
         print("   ✅ Ollama is running")
     else:
         print("   ❌ Ollama is not running or has no models")
@@ -33,8 +43,7 @@ async def quick_test():
     
     # Test 2: List available models
     print("\n2. Checking available models...")
-    models = await client.list_models()
-    if models:
+    if models and not isinstance(models, BaseException):
         print(f"   ✅ Found {len(models)} models:")
         for model in models:
             print(f"      - {model}")
@@ -45,15 +54,15 @@ async def quick_test():
     
     # Test 3: Find fastest model
     print("\n3. Finding fastest model...")
-    fastest = await client.get_fastest_available_model()
-    if fastest:
+    if fastest and not isinstance(fastest, BaseException):
         print(f"   ✅ Fastest model: {fastest}")
     else:
         print("   ❌ No fast models available")
         print("   💡 Solution: Run 'ollama pull llama3.2:1b'")
         return
     
-    # Test 4: Generate a response
+    # Test 4: Generate a response with the fastest model only; loading
+    # every installed model at once can exhaust a local Ollama's memory
     print("\n4. Testing AI response...")
     messages = [
         {"role": "system", "content": "You are ECHO, a helpful productivity assistant."},
@@ -61,7 +70,7 @@ async def quick_test():
     ]
     
     try:
-        response = await client.generate_response(messages)
+        response = await client.generate_response(messages, model=fastest)
         if response:
             print(f"   ✅ AI Response: {response}")
             print("\n🎉 SUCCESS! ECHO AI is working!")
@@ -12,10 +12,27 @@ Run this to see your productivity analytics in action!
 """
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 
 # API base URL (when server is running)
 BASE_URL = "http://localhost:8000/api/v1"
+REQUEST_TIMEOUT = 30
+
+# One keep-alive session for the whole suite, with a pool large enough
+# that every concurrent request gets its own persistent connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=7))
+
+def fetch_concurrently(session, endpoints):
+    """GET independent endpoints in parallel, returning responses keyed by name"""
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        futures = {
+            name: executor.submit(session.get, f"{BASE_URL}{path}", params=params, timeout=REQUEST_TIMEOUT)
+            for name, (path, params) in endpoints.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
 def test_analytics_api():
     """Test all analytics API endpoints"""
@@ -26,9 +43,40 @@ def test_analytics_api():
     print()
     
     try:
+        # Compare last 15 days vs previous 15 days (Test 4)
+        today = date.today()
+        current_start = today - timedelta(days=14)
+        current_end = today
+        previous_start = current_start - timedelta(days=15)
+        previous_end = current_start - timedelta(days=1)
+        
+        compare_params = {
+            "current_start": current_start.isoformat(),
+            "current_end": current_end.isoformat(),
+            "previous_start": previous_start.isoformat(),
+            "previous_end": previous_end.isoformat()
+        }
+        
+        # Last 7 days (Test 5)
+        start_date = (today - timedelta(days=7)).isoformat()
+        end_date = today.isoformat()
+        weekly_params = {"start_date": start_date, "end_date": end_date}
+        
+        # All endpoints are independent reads, so fetch them at once and
+        # report the results in order below
+        responses = fetch_concurrently(SESSION, {
+            "overview": ("/analytics/overview", None),
+            "charts": ("/analytics/charts", None),
+            "insights": ("/analytics/insights", None),
+            "compare": ("/analytics/compare", compare_params),
+            "weekly": ("/analytics/overview", weekly_params),
+            "specific_charts": ("/analytics/charts", {"chart_types": "daily_tasks,task_priority"}),
+            "export": ("/analytics/export", None),
+        })
+        
         # Test 1: Get productivity overview
         print("📈 TEST 1: Getting productivity overview...")
-        response = requests.get(f"{BASE_URL}/analytics/overview")
+        response = responses["overview"]
         if response.status_code == 200:
             overview = response.json()
             print(f"✅ Productivity Overview:")
@@ -59,7 +107,7 @@ def test_analytics_api():
         
         # Test 2: Get chart data
         print(f"\n📊 TEST 2: Getting chart data for visualizations...")
-        response = requests.get(f"{BASE_URL}/analytics/charts")
+        response = responses["charts"]
         if response.status_code == 200:
             charts = response.json()
             print(f"✅ Generated {len(charts)} charts:")
@@ -75,7 +123,7 @@ def test_analytics_api():
         
         # Test 3: Get AI insights
         print(f"\n🧠 TEST 3: Getting AI-powered insights...")
-        response = requests.get(f"{BASE_URL}/analytics/insights")
+        response = responses["insights"]
         if response.status_code == 200:
             insights = response.json()
             print(f"✅ Discovered {len(insights)} insights:")
@@ -91,21 +139,7 @@ def test_analytics_api():
         
         # Test 4: Compare periods
         print(f"📅 TEST 4: Comparing productivity periods...")
-        # Compare last 15 days vs previous 15 days
-        today = date.today()
-        current_start = today - timedelta(days=14)
-        current_end = today
-        previous_start = current_start - timedelta(days=15)
-        previous_end = current_start - timedelta(days=1)
-        
-        params = {
-            "current_start": current_start.isoformat(),
-            "current_end": current_end.isoformat(),
-            "previous_start": previous_start.isoformat(),
-            "previous_end": previous_end.isoformat()
-        }
-        
-        response = requests.get(f"{BASE_URL}/analytics/compare", params=params)
+        response = responses["compare"]
         if response.status_code == 200:
             comparison = response.json()
             print(f"✅ Period Comparison:")
@@ -129,11 +163,7 @@ def test_analytics_api():
         
         # Test 5: Test specific date range
         print(f"\n📆 TEST 5: Testing custom date range...")
-        start_date = (date.today() - timedelta(days=7)).isoformat()
-        end_date = date.today().isoformat()
-        
-        params = {"start_date": start_date, "end_date": end_date}
-        response = requests.get(f"{BASE_URL}/analytics/overview", params=params)
+        response = responses["weekly"]
         if response.status_code == 200:
             weekly_overview = response.json()
             print(f"✅ Last 7 days analytics:")
@@ -148,8 +178,7 @@ def test_analytics_api():
         
         # Test 6: Test specific chart types
         print(f"\n📊 TEST 6: Testing specific chart types...")
-        params = {"chart_types": "daily_tasks,task_priority"}
-        response = requests.get(f"{BASE_URL}/analytics/charts", params=params)
+        response = responses["specific_charts"]
         if response.status_code == 200:
             specific_charts = response.json()
             print(f"✅ Generated {len(specific_charts)} specific charts:")
@@ -160,13 +189,13 @@ def test_analytics_api():
         
         # Test 7: Export data
         print(f"\n💾 TEST 7: Testing data export...")
-        response = requests.get(f"{BASE_URL}/analytics/export")
+        response = responses["export"]
         if response.status_code == 200:
             export_data = response.json()
             print(f"✅ Data exported successfully:")
             print(f"   Export type: {export_data['export_type']}")
             print(f"   Exported at: {export_data['exported_at']}")
-            print(f"   Data size: {len(str(export_data['data']))} characters")
+            print(f"   Data size: {len(response.content)} bytes")
         else:
             print(f"❌ Failed to export data: {response.status_code}")
         
@@ -215,5 +244,8 @@ def show_analytics_api_documentation():
     print("   • Data spanning several days")
 
 if __name__ == "__main__":
-    test_analytics_api()
+    try:
+        test_analytics_api()
+    finally:
+        SESSION.close()
     show_analytics_api_documentation()
\ No newline at end of file
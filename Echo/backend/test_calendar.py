@@ -1,16 +1,21 @@
 """Test calendar API functionality"""
 import requests
-import json
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+
+# Reuse one keep-alive connection for every call to the local server
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=20))
 
 def test_calendar_api():
     base_url = "http://localhost:8000/api/v1"
     
     print("🧪 Testing Calendar API...")
+    now = datetime.now()
     
     # Test 1: Get all events (should be empty initially)
     try:
-        response = requests.get(f"{base_url}/events/", timeout=5)
+        response = SESSION.get(f"{base_url}/events/", timeout=5)
         print(f"✅ GET /events/ - Status: {response.status_code}")
         if response.status_code == 200:
             events = response.json()
@@ -26,13 +31,13 @@ def test_calendar_api():
         new_event = {
             "title": "Test Calendar Event",
             "description": "Testing calendar functionality",
-            "start_time": datetime.now().isoformat(),
-            "end_time": (datetime.now() + timedelta(hours=1)).isoformat(),
+            "start_time": now.isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat(),
             "event_type": "meeting",
             "status": "scheduled"
         }
         
-        response = requests.post(f"{base_url}/events/", json=new_event, timeout=5)
+        response = SESSION.post(f"{base_url}/events/", json=new_event, timeout=5)
         print(f"✅ POST /events/ - Status: {response.status_code}")
         if response.status_code == 201:
             created_event = response.json()
@@ -40,7 +45,7 @@ def test_calendar_api():
             event_id = created_event['id']
             
             # Test 3: Get the created event
-            response = requests.get(f"{base_url}/events/{event_id}", timeout=5)
+            response = SESSION.get(f"{base_url}/events/{event_id}", timeout=5)
             print(f"✅ GET /events/{event_id} - Status: {response.status_code}")
             
             return True
@@ -52,7 +57,10 @@ def test_calendar_api():
     return False
 
 if __name__ == "__main__":
-    success = test_calendar_api()
+    try:
+        success = test_calendar_api()
+    finally:
+        SESSION.close()
     if success:
         print("🎉 Calendar API is working!")
     else:
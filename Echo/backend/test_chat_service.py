@@ -1,42 +1,63 @@
 #!/usr/bin/env python3
 """
 Test the chat service with local AI
+
+Under pytest the database session comes from the shared db_session
+fixture; run directly, it opens one from SessionLocal.
 """
 import asyncio
-import sys
-sys.path.append('.')
 import os
 
+import pytest
+
 # Set environment for local AI
 os.environ['USE_LOCAL_AI'] = 'true'
 
 from app.services.chat_service import ChatService
-from app.core.database import get_db
+from app.services.local_ai_client import local_ai_client
+from app.core.database import SessionLocal
+
+# The quick "Hello" check and the fuller task question share one test
+PROMPTS = [
+    "Hello",
+    "Hello, can you help me with my tasks?"
+]
+
+
+@pytest.fixture(scope="session")
+def local_ai_available():
+    """Probe Ollama once for the whole test session"""
+    return asyncio.run(local_ai_client.is_available())
 
-async def test_chat_service():
-    print("Testing chat service with local AI...")
+
+@pytest.mark.parametrize("prompt", PROMPTS)
+async def test_chat_service(db_session, local_ai_available, prompt):
+    mode = "local AI" if local_ai_available else "fallback responses"
+    print(f"Testing chat service with {mode}...")
     
-    # Get a database session
-    from app.core.database import SessionLocal
-    db = SessionLocal()
+    # Initialize chat service with the shared database session
+    chat_service = ChatService(db_session)
+    
+    response = await chat_service.generate_response(user_message=prompt)
     
+    print(f"Chat response: {response}")
+    assert response, "Chat service returned an empty response"
+
+
+async def main():
+    """Run every prompt against one session and one availability probe"""
+    available = await local_ai_client.is_available()
+    db = SessionLocal()
     try:
-        # Initialize chat service with database session
-        chat_service = ChatService(db)
-        
-        # Test with a simple message
-        response = await chat_service.generate_response(
-            user_message="Hello, can you help me with my tasks?"
-        )
-        
-        print(f"Chat response: {response}")
-        
-    except Exception as e:
-        print(f"Error in chat service: {e}")
-        import traceback
-        traceback.print_exc()
+        for prompt in PROMPTS:
+            await test_chat_service(db, available, prompt)
     finally:
         db.close()
 
 if __name__ == '__main__':
-    asyncio.run(test_chat_service())
+    try:
+        asyncio.run(main())
+    except Exception as e:
+        print(f"Error in chat service: {e}")
+        import traceback
+        traceback.print_exc()
@@ -10,24 +10,43 @@ This script tests the calendar/events functionality by:
 5. Testing reminders
 """
 import httpx
-import json
 from datetime import datetime, timedelta
 import asyncio
 
+from script_utils import buffered_stdout, parse_json
+
 BASE_URL = "http://localhost:8000/api/v1"
 
+# Most cleanup deletes in flight at once
+DELETE_CONCURRENCY = 10
+
+# Transport override for the pooled client; pytest swaps in the in-process app
+TRANSPORT = None
+
+
+def unwrap(result):
+    """Return a response gathered with return_exceptions=True, re-raising errors"""
+    if isinstance(result, Exception):
+        raise result
+    return result
+
 async def test_events_api():
     """Test all events API endpoints"""
     
     print("🗓️  TESTING EVENTS API")
     print("=" * 50)
     
-    async with httpx.AsyncClient() as client:
+    # One pooled client for every subtest; paths below are relative to BASE_URL
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        limits=httpx.Limits(max_keepalive_connections=10),
+        transport=TRANSPORT,
+    ) as client:
         
         # Test 1: Health check
         print("\n1. Testing API health...")
         try:
-            response = await client.get(f"{BASE_URL}/health")
+            response = await client.get("/health")
             if response.status_code == 200:
                 print("✅ API is healthy")
             else:
@@ -40,22 +59,23 @@ async def test_events_api():
         # Test 2: Create events
         print("\n2. Creating sample events...")
         
-        # Sample events
+        # Sample events, all relative to one timestamp
+        now = datetime.now()
         events_to_create = [
             {
                 "title": "Team Standup",
                 "description": "Daily team synchronization meeting",
                 "location": "Conference Room A",
-                "start_time": (datetime.now() + timedelta(days=1, hours=9)).isoformat(),
-                "end_time": (datetime.now() + timedelta(days=1, hours=9, minutes=30)).isoformat(),
+                "start_time": (now + timedelta(days=1, hours=9)).isoformat(),
+                "end_time": (now + timedelta(days=1, hours=9, minutes=30)).isoformat(),
                 "event_type": "meeting",
                 "all_day": False
             },
             {
                 "title": "Project Deadline",
                 "description": "Final submission for Q1 project",
-                "start_time": (datetime.now() + timedelta(days=7)).isoformat(),
-                "end_time": (datetime.now() + timedelta(days=7, hours=1)).isoformat(),
+                "start_time": (now + timedelta(days=7)).isoformat(),
+                "end_time": (now + timedelta(days=7, hours=1)).isoformat(),
                 "event_type": "task",
                 "all_day": True
             },
@@ -63,51 +83,42 @@ async def test_events_api():
                 "title": "Doctor Appointment",
                 "description": "Annual checkup",
                 "location": "Medical Center",
-                "start_time": (datetime.now() + timedelta(days=3, hours=14)).isoformat(),
-                "end_time": (datetime.now() + timedelta(days=3, hours=15)).isoformat(),
+                "start_time": (now + timedelta(days=3, hours=14)).isoformat(),
+                "end_time": (now + timedelta(days=3, hours=15)).isoformat(),
                 "event_type": "personal",
                 "all_day": False
             }
         ]
         
+        # Event creations are independent, so send them together
+        results = await asyncio.gather(
+            *(client.post("/events/", json=event_data) for event_data in events_to_create),
+            return_exceptions=True,
+        )
+        
         created_events = []
-        for event_data in events_to_create:
-            try:
-                response = await client.post(f"{BASE_URL}/events/", json=event_data)
-                if response.status_code == 201:
-                    event = response.json()
-                    created_events.append(event)
-                    print(f"✅ Created event: {event['title']}")
-                else:
-                    print(f"❌ Failed to create event: {response.status_code} - {response.text}")
-            except Exception as e:
-                print(f"❌ Error creating event: {e}")
+        for response in results:
+            if isinstance(response, Exception):
+                print(f"❌ Error creating event: {response}")
+            elif response.status_code == 201:
+                event = parse_json(response)
+                created_events.append(event)
+                print(f"✅ Created event: {event['title']}")
+            else:
+                print(f"❌ Failed to create event: {response.status_code} - {response.text}")
         
         if not created_events:
             print("❌ No events created, stopping tests")
             return
         
-        # Test 3: Get all events
-        print(f"\n3. Retrieving all events...")
-        try:
-            response = await client.get(f"{BASE_URL}/events/")
-            if response.status_code == 200:
-                events_list = response.json()
-                print(f"✅ Retrieved {events_list['total']} events")
-                print(f"   Page {events_list['page']} of events")
-            else:
-                print(f"❌ Failed to get events: {response.status_code}")
-        except Exception as e:
-            print(f"❌ Error getting events: {e}")
-        
-        # Test 4: Get specific event
-        print(f"\n4. Getting specific event details...")
+        # Test 3: Get specific event
+        print(f"\n3. Getting specific event details...")
         if created_events:
             event_id = created_events[0]['id']
             try:
-                response = await client.get(f"{BASE_URL}/events/{event_id}")
+                response = await client.get(f"/events/{event_id}")
                 if response.status_code == 200:
-                    event = response.json()
+                    event = parse_json(response)
                     print(f"✅ Retrieved event: {event['title']}")
                     print(f"   Duration: {event['duration_minutes']} minutes")
                     print(f"   Recurring: {event['is_recurring']}")
@@ -116,8 +127,8 @@ async def test_events_api():
             except Exception as e:
                 print(f"❌ Error getting event: {e}")
         
-        # Test 5: Update event
-        print(f"\n5. Updating event...")
+        # Test 4: Update event
+        print(f"\n4. Updating event...")
         if created_events:
             event_id = created_events[0]['id']
             update_data = {
@@ -125,9 +136,9 @@ async def test_events_api():
                 "location": "Conference Room B"
             }
             try:
-                response = await client.put(f"{BASE_URL}/events/{event_id}", json=update_data)
+                response = await client.put(f"/events/{event_id}", json=update_data)
                 if response.status_code == 200:
-                    updated_event = response.json()
+                    updated_event = parse_json(response)
                     print(f"✅ Updated event: {updated_event['title']}")
                     print(f"   New location: {updated_event['location']}")
                 else:
@@ -135,21 +146,8 @@ async def test_events_api():
             except Exception as e:
                 print(f"❌ Error updating event: {e}")
         
-        # Test 6: Get month events
-        print(f"\n6. Getting events for current month...")
-        now = datetime.now()
-        try:
-            response = await client.get(f"{BASE_URL}/events/month/{now.year}/{now.month}")
-            if response.status_code == 200:
-                month_data = response.json()
-                print(f"✅ Retrieved {month_data['total_events']} events for {now.year}-{now.month:02d}")
-            else:
-                print(f"❌ Failed to get month events: {response.status_code}")
-        except Exception as e:
-            print(f"❌ Error getting month events: {e}")
-        
-        # Test 7: Check conflicts
-        print(f"\n7. Testing conflict detection...")
+        # Test 5: Check conflicts
+        print(f"\n5. Testing conflict detection...")
         if created_events:
             # Try to create a conflicting event
             conflict_check = {
@@ -158,9 +156,9 @@ async def test_events_api():
                 "all_day": False
             }
             try:
-                response = await client.post(f"{BASE_URL}/events/conflicts", json=conflict_check)
+                response = await client.post("/events/conflicts", json=conflict_check)
                 if response.status_code == 200:
-                    conflict_result = response.json()
+                    conflict_result = parse_json(response)
                     if conflict_result['has_conflicts']:
                         print(f"✅ Conflict detection working: Found {len(conflict_result['conflicting_events'])} conflicts")
                     else:
@@ -170,8 +168,8 @@ async def test_events_api():
             except Exception as e:
                 print(f"❌ Error checking conflicts: {e}")
         
-        # Test 8: Add reminder
-        print(f"\n8. Adding reminder to event...")
+        # Test 6: Add reminder
+        print(f"\n6. Adding reminder to event...")
         if created_events:
             event_id = created_events[0]['id']
             reminder_data = {
@@ -179,21 +177,56 @@ async def test_events_api():
                 "method": "notification"
             }
             try:
-                response = await client.post(f"{BASE_URL}/events/{event_id}/reminders", json=reminder_data)
+                response = await client.post(f"/events/{event_id}/reminders", json=reminder_data)
                 if response.status_code == 201:
-                    reminder = response.json()
+                    reminder = parse_json(response)
                     print(f"✅ Added reminder: {reminder['minutes_before']} minutes before")
                 else:
                     print(f"❌ Failed to add reminder: {response.status_code}")
             except Exception as e:
                 print(f"❌ Error adding reminder: {e}")
         
+        # Tests 7-11 are read-only, so issue them together and report in order
+        all_events, month_events, upcoming_events, type_stats, search = await asyncio.gather(
+            client.get("/events/"),
+            client.get(f"/events/month/{now.year}/{now.month}"),
+            client.get("/events/upcoming/list?limit=5"),
+            client.get("/events/stats/by-type"),
+            client.get("/events/?search=team"),
+            return_exceptions=True,
+        )
+        
+        # Test 7: Get all events
+        print(f"\n7. Retrieving all events...")
+        try:
+            response = unwrap(all_events)
+            if response.status_code == 200:
+                events_list = parse_json(response)
+                print(f"✅ Retrieved {events_list['total']} events")
+                print(f"   Page {events_list['page']} of events")
+            else:
+                print(f"❌ Failed to get events: {response.status_code}")
+        except Exception as e:
+            print(f"❌ Error getting events: {e}")
+        
+        # Test 8: Get month events
+        print(f"\n8. Getting events for current month...")
+        try:
+            response = unwrap(month_events)
+            if response.status_code == 200:
+                month_data = parse_json(response)
+                print(f"✅ Retrieved {month_data['total_events']} events for {now.year}-{now.month:02d}")
+            else:
+                print(f"❌ Failed to get month events: {response.status_code}")
+        except Exception as e:
+            print(f"❌ Error getting month events: {e}")
+        
         # Test 9: Get upcoming events
         print(f"\n9. Getting upcoming events...")
         try:
-            response = await client.get(f"{BASE_URL}/events/upcoming/list?limit=5")
+            response = unwrap(upcoming_events)
             if response.status_code == 200:
-                upcoming = response.json()
+                upcoming = parse_json(response)
                 print(f"✅ Retrieved {len(upcoming)} upcoming events")
                 for event in upcoming[:3]:  # Show first 3
                     print(f"   - {event['title']} at {event['start_time']}")
@@ -205,9 +238,9 @@ async def test_events_api():
         # Test 10: Get event statistics
         print(f"\n10. Getting event statistics...")
         try:
-            response = await client.get(f"{BASE_URL}/events/stats/by-type")
+            response = unwrap(type_stats)
             if response.status_code == 200:
-                stats = response.json()
+                stats = parse_json(response)
                 print(f"✅ Event statistics:")
                 for event_type, count in stats['stats_by_type'].items():
                     print(f"   - {event_type}: {count} events")
@@ -220,9 +253,9 @@ async def test_events_api():
         # Test 11: Search events
         print(f"\n11. Searching events...")
         try:
-            response = await client.get(f"{BASE_URL}/events/?search=team")
+            response = unwrap(search)
             if response.status_code == 200:
-                search_results = response.json()
+                search_results = parse_json(response)
                 print(f"✅ Search found {search_results['total']} events matching 'team'")
             else:
                 print(f"❌ Failed to search events: {response.status_code}")
@@ -231,17 +264,29 @@ async def test_events_api():
         
         # Test 12: Delete event (cleanup)
         print(f"\n12. Cleaning up - deleting test events...")
+        # Bounded so a scaled-up run doesn't flood the server's workers
+        delete_slots = asyncio.Semaphore(DELETE_CONCURRENCY)
+        
+        async def delete_event(event):
+            async with delete_slots:
+                try:
+                    return await client.delete(f"/events/{event['id']}")
+                except Exception as e:  # reported per event below
+                    return e
+        
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(delete_event(event)) for event in created_events]
+        results = [task.result() for task in tasks]
+        
         deleted_count = 0
-        for event in created_events:
-            try:
-                response = await client.delete(f"{BASE_URL}/events/{event['id']}")
-                if response.status_code == 204:
-                    deleted_count += 1
-                    print(f"✅ Deleted event: {event['title']}")
-                else:
-                    print(f"❌ Failed to delete event: {response.status_code}")
-            except Exception as e:
-                print(f"❌ Error deleting event: {e}")
+        for event, response in zip(created_events, results):
+            if isinstance(response, Exception):
+                print(f"❌ Error deleting event: {response}")
+            elif response.status_code == 204:
+                deleted_count += 1
+                print(f"✅ Deleted event: {event['title']}")
+            else:
+                print(f"❌ Failed to delete event: {response.status_code}")
         
         print(f"\n🎉 Events API testing completed!")
         print(f"   Created: {len(created_events)} events")
@@ -271,5 +316,7 @@ def show_events_api_documentation():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_events_api())
+    # The run is short, so its progress lines are written out in one go
+    with buffered_stdout():
+        asyncio.run(test_events_api())
     show_events_api_documentation()
\ No newline at end of file
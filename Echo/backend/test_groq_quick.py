@@ -6,17 +6,32 @@ Test your Groq API key quickly to make sure it works.
 """
 import asyncio
 import httpx
-from pathlib import Path
-import sys
-
-# Add the app directory to Python path
-sys.path.append(str(Path(__file__).parent))
+from typing import Optional
 
 from app.core.config import settings
 
+# Settings for the client test_groq_api opens when the caller passes none
+GROQ_CLIENT_OPTIONS = dict(
+    base_url="https://api.groq.com",
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=2),
+    headers={
+        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
+        "Content-Type": "application/json"
+    }
+)
+
 
-async def test_groq_api():
-    """Test Groq API directly"""
+async def test_groq_api(client: Optional[httpx.AsyncClient] = None):
+    """
+    Test Groq API directly
+    
+    Args:
+        client: Optional AsyncClient built from GROQ_CLIENT_OPTIONS; a loop or
+            retry harness passes one to reuse its connections across calls.
+            Without one, a client is opened and closed on the running event
+            loop, so no pooled connection outlives it (e.g. under pytest)
+    """
     print("🚀 Testing Groq API")
     print("=" * 30)
     
@@ -29,48 +44,50 @@ async def test_groq_api():
     
     print(f"✅ API key configured: {settings.GROQ_API_KEY[:10]}...")
     
-    # Test API call
+    if client is None:
+        async with httpx.AsyncClient(**GROQ_CLIENT_OPTIONS) as client:
+            return await call_groq(client)
+    return await call_groq(client)
+
+
+async def call_groq(client: httpx.AsyncClient) -> bool:
+    """Send one short chat completion through the given client"""
     try:
         print("\n🧪 Testing API call...")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {settings.GROQ_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama3-8b-8192",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are ECHO, a helpful productivity assistant. Be brief."
-                        },
-                        {
-                            "role": "user",
-                            "content": "Hello! Are you working? Just say yes or no."
-                        }
-                    ],
-                    "max_tokens": 50,
-                    "temperature": 0.7
-                }
-            )
-            
-            print(f"Response status: {response.status_code}")
+        response = await client.post(
+            "/openai/v1/chat/completions",
+            json={
+                "model": "llama3-8b-8192",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are ECHO, a helpful productivity assistant. Be brief."
+                    },
+                    {
+                        "role": "user",
+                        "content": "Hello! Are you working? Just say yes or no."
+                    }
+                ],
+                "max_tokens": 50,
+                "temperature": 0.7
+            }
+        )
+        
+        print(f"Response status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = response.json()
+            ai_response = result["choices"][0]["message"]["content"].strip()
+            print(f"✅ AI Response: {ai_response}")
+            print("\n🎉 SUCCESS! Groq API is working!")
+            print("Your ECHO is now ready for deployment! 🚀")
+            return True
+        else:
+            print(f"❌ API Error: {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
             
-            if response.status_code == 200:
-                result = response.json()
-                ai_response = result["choices"][0]["message"]["content"].strip()
-                print(f"✅ AI Response: {ai_response}")
-                print("\n🎉 SUCCESS! Groq API is working!")
-                print("Your ECHO is now ready for deployment! 🚀")
-                return True
-            else:
-                print(f"❌ API Error: {response.status_code}")
-                print(f"Response: {response.text}")
-                return False
-                
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
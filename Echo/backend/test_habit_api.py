@@ -8,184 +8,277 @@ This script demonstrates how your habit system works by:
 4. Getting statistics and analytics
 5. Testing the streak calculation algorithm
 
-Run this to see your habit tracking in action!
+Run this to see your habit tracking in action! Each step is also a pytest
+test with its own habit, so `pytest -n auto --dist loadfile` spreads them
+across workers.
 """
+import pytest
 import requests
-import json
+import orjson
 from datetime import datetime, date, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 
 # API base URL (when server is running)
 BASE_URL = "http://localhost:8000/api/v1"
 
-def test_habit_api():
-    """Test all habit API endpoints with streak calculation"""
+# Reuse one keep-alive connection for every call to the local server,
+# retrying transient 5xx replies without reconnecting
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+JSON_HEADERS = {"Content-Type": "application/json"}
+SESSION.headers.update(JSON_HEADERS)
+
+def send_json(session, method, url, payload):
+    """Send a JSON body encoded with the fastest encoder available"""
+    return session.request(method, url, data=orjson.dumps(payload), headers=JSON_HEADERS)
+
+
+HABIT_DATA = {
+    "name": "Morning Exercise",
+    "description": "30 minutes of cardio to start the day",
+    "frequency": "daily",
+    "target_count": 1
+}
+
+
+def create_habit(session):
+    """POST the sample habit and return its id"""
+    response = send_json(session, "POST", f"{BASE_URL}/habits", HABIT_DATA)
+    assert response.status_code == 201, f"Failed to create habit: {response.status_code}"
+    created_habit = orjson.loads(response.content)
+    print(f"✅ Habit created successfully!")
+    print(f"   ID: {created_habit['id']}")
+    print(f"   Name: {created_habit['name']}")
+    print(f"   Frequency: {created_habit['frequency']}")
+    print(f"   Current Streak: {created_habit['current_streak']}")
+    print(f"   Longest Streak: {created_habit['longest_streak']}")
+    return created_habit["id"]
+
+
+def log_streak(session, habit_id, today):
+    """Log the past 5 days plus today in one request"""
+    bulk_logs = [
+        {
+            "completed_date": (today - timedelta(days=i)).isoformat(),
+            "count": 1,
+            "notes": f"Day {6-i} of building my exercise habit!"
+        }
+        for i in range(5, 0, -1)  # 5 days ago to yesterday
+    ]
+    bulk_logs.append({
+        "completed_date": today.isoformat(),
+        "count": 1,
+        "notes": "Today's workout - feeling strong!"
+    })
+    
+    response = send_json(session, "POST", f"{BASE_URL}/habits/{habit_id}/logs/bulk", bulk_logs)
+    assert response.status_code == 201, f"Failed to log completions: {response.status_code}"
+    for log in orjson.loads(response.content):
+        print(f"   ✅ Logged completion for {log['completed_date']}")
+
+
+@pytest.fixture
+def today():
+    """One clock read for every date a test logs against"""
+    return date.today()
+
+
+@pytest.fixture
+def habit(api_session):
+    """A fresh habit for one test, deleted afterwards"""
+    try:
+        habit_id = create_habit(api_session)
+    except requests.ConnectionError as e:
+        pytest.skip(f"Server not running: {e}")
+    yield habit_id
+    api_session.delete(f"{BASE_URL}/habits/{habit_id}")
+
+
+@pytest.fixture
+def streak_habit(api_session, habit, today):
+    """A fresh habit with a six-day streak ending today"""
+    log_streak(api_session, habit, today)
+    return habit
+
+
+def test_create_habit(api_session):
+    """TEST 1: Create a new habit"""
+    print("🏃 TEST 1: Creating a new habit...")
+    habit_id = create_habit(api_session)
+    api_session.delete(f"{BASE_URL}/habits/{habit_id}")
+
+
+def test_log_completions(api_session, habit, today):
+    """TEST 2: Log completions for several days to build a streak"""
+    print(f"\n📅 TEST 2: Logging completions to build a streak...")
+    log_streak(api_session, habit, today)
+
+
+def test_streak(api_session, streak_habit):
+    """TEST 3: Check updated habit with streak"""
+    print(f"\n🔥 TEST 3: Checking habit with calculated streak...")
+    response = api_session.get(f"{BASE_URL}/habits/{streak_habit}")
+    assert response.status_code == 200, f"Failed to get updated habit: {response.status_code}"
+    updated_habit = orjson.loads(response.content)
+    assert updated_habit["current_streak"] == 6
+    print(f"✅ Habit streak updated!")
+    print(f"   Current Streak: {updated_habit['current_streak']} days 🔥")
+    print(f"   Longest Streak: {updated_habit['longest_streak']} days 🏆")
+
+
+def test_history(api_session, streak_habit):
+    """TEST 4: Get completion history"""
+    print(f"\n📋 TEST 4: Getting completion history...")
+    # The endpoint caps each page with `limit`, so the body stays bounded
+    response = api_session.get(f"{BASE_URL}/habits/{streak_habit}/logs", params={"limit": 100})
+    assert response.status_code == 200, f"Failed to get logs: {response.status_code}"
+    logs = orjson.loads(response.content)
+    assert len(logs) == 6
+    print(f"✅ Found {len(logs)} completion logs:")
+    for log in logs:
+        print(f"   • {log['completed_date']}: {log['count']}x - {log['notes']}")
+
+
+def test_stats(api_session, streak_habit):
+    """TEST 5: Get detailed statistics"""
+    print(f"\n📊 TEST 5: Getting habit statistics...")
+    response = api_session.get(f"{BASE_URL}/habits/{streak_habit}/stats")
+    assert response.status_code == 200, f"Failed to get statistics: {response.status_code}"
+    stats = orjson.loads(response.content)
+    assert stats["total_completions"] == 6
+    print(f"✅ Habit Statistics:")
+    print(f"   Total Completions: {stats['total_completions']}")
+    print(f"   Completion Rate: {stats['completion_rate']}%")
+    print(f"   Current Streak: {stats['current_streak']} days")
+    print(f"   Longest Streak: {stats['longest_streak']} days")
+    print(f"   Days Since Creation: {stats['days_since_creation']}")
+    print(f"   Last Completed: {stats['last_completed']}")
+    
+    # Unchanged data is revalidated with the ETag instead of recomputed
+    response = api_session.get(
+        f"{BASE_URL}/habits/{streak_habit}/stats", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 304, f"Statistics not revalidated: {response.status_code}"
+    print(f"   ✅ Unchanged statistics revalidated (304 Not Modified)")
+
+
+def test_all_habits(api_session):
+    """TEST 6: Get all habits"""
+    print(f"\n📝 TEST 6: Getting all habits...")
+    response = api_session.get(f"{BASE_URL}/habits")
+    assert response.status_code == 200, f"Failed to get habits: {response.status_code}"
+    habits = orjson.loads(response.content)
+    print(f"✅ Found {len(habits)} habits:")
+    for habit in habits:
+        print(f"   • {habit['name']} - {habit['current_streak']} day streak")
+
+
+def test_overall_stats(api_session):
+    """TEST 7: Get overall statistics"""
+    print(f"\n🏆 TEST 7: Getting overall habit statistics...")
+    response = api_session.get(f"{BASE_URL}/habits/stats/summary")
+    assert response.status_code == 200, f"Failed to get overall statistics: {response.status_code}"
+    overall_stats = orjson.loads(response.content)
+    print(f"✅ Overall Statistics:")
+    print(f"   Total Habits: {overall_stats['total_habits']}")
+    print(f"   Active Habits: {overall_stats['active_habits']}")
+    print(f"   Total Completions: {overall_stats['total_completions']}")
+    print(f"   Best Current Streak: {overall_stats['best_current_streak']} days")
+
+
+def test_streak_break(api_session, streak_habit, today):
+    """TEST 8: Test streak break (skip a day)"""
+    print(f"\n💔 TEST 8: Testing streak break (skip tomorrow)...")
+    print("   (Skipping tomorrow to see how streaks handle gaps)")
+    
+    # Log completion for day after tomorrow
+    future_date = (today + timedelta(days=2)).isoformat()
+    future_log = {
+        "habit_id": streak_habit,
+        "completed_date": future_date,
+        "count": 1,
+        "notes": "Back after missing a day"
+    }
+    
+    response = send_json(api_session, "POST", f"{BASE_URL}/habits/{streak_habit}/logs", future_log)
+    assert response.status_code == 201, f"Failed to log completion: {response.status_code}"
+    print(f"   ✅ Logged completion for {future_date}")
+    
+    # Check streak after gap
+    response = api_session.get(f"{BASE_URL}/habits/{streak_habit}")
+    assert response.status_code == 200, f"Failed to get habit: {response.status_code}"
+    habit_after_gap = orjson.loads(response.content)
+    assert habit_after_gap["longest_streak"] == 6
+    print(f"   📊 Streak after gap:")
+    print(f"      Current Streak: {habit_after_gap['current_streak']} days")
+    print(f"      Longest Streak: {habit_after_gap['longest_streak']} days")
+    print("   💡 Current streak reset due to gap, but longest streak preserved!")
+
+
+def test_update(api_session, habit):
+    """TEST 9: Update habit"""
+    print(f"\n✏️ TEST 9: Updating habit...")
+    update_data = {
+        "target_count": 2,
+        "description": "Updated: 45 minutes of cardio and strength training"
+    }
+    response = send_json(api_session, "PUT", f"{BASE_URL}/habits/{habit}", update_data)
+    assert response.status_code == 200, f"Failed to update habit: {response.status_code}"
+    updated_habit = orjson.loads(response.content)
+    assert updated_habit["target_count"] == 2
+    print(f"✅ Habit updated successfully!")
+    print(f"   New Target Count: {updated_habit['target_count']}")
+    print(f"   New Description: {updated_habit['description']}")
+
+
+def test_delete(api_session, habit):
+    """TEST 10: Clean up - delete habit"""
+    print(f"\n🗑️ TEST 10: Cleaning up - deleting habit...")
+    response = api_session.delete(f"{BASE_URL}/habits/{habit}")
+    assert response.status_code == 204, f"Failed to delete habit: {response.status_code}"
+    print(f"✅ Habit deleted successfully!")
+
+
+def run_habit_tests(session):
+    """Run every habit test in order against one habit on a live server"""
     print("🎯 TESTING HABIT TRACKING API")
     print("=" * 50)
     print("Make sure to run 'python run.py' in another terminal first!")
     print()
     
+    # One clock read for every date this run logs against
+    today = date.today()
+    
     try:
-        # Test 1: Create a new habit
         print("🏃 TEST 1: Creating a new habit...")
-        habit_data = {
-            "name": "Morning Exercise",
-            "description": "30 minutes of cardio to start the day",
-            "frequency": "daily",
-            "target_count": 1
-        }
-        
-        response = requests.post(f"{BASE_URL}/habits", json=habit_data)
-        if response.status_code == 201:
-            created_habit = response.json()
-            habit_id = created_habit["id"]
-            print(f"✅ Habit created successfully!")
-            print(f"   ID: {habit_id}")
-            print(f"   Name: {created_habit['name']}")
-            print(f"   Frequency: {created_habit['frequency']}")
-            print(f"   Current Streak: {created_habit['current_streak']}")
-            print(f"   Longest Streak: {created_habit['longest_streak']}")
-        else:
-            print(f"❌ Failed to create habit: {response.status_code}")
+        try:
+            habit_id = create_habit(session)
+        except AssertionError as e:
+            print(f"❌ {e}")
             return
         
-        # Test 2: Log completions for several days to build a streak
-        print(f"\n📅 TEST 2: Logging completions to build a streak...")
-        
-        # Log completions for the past 5 days
-        for i in range(5, 0, -1):  # 5 days ago to yesterday
-            completion_date = (date.today() - timedelta(days=i)).isoformat()
-            log_data = {
-                "completed_date": completion_date,
-                "count": 1,
-                "notes": f"Day {6-i} of building my exercise habit!"
-            }
-            
-            response = requests.post(f"{BASE_URL}/habits/{habit_id}/logs", json=log_data)
-            if response.status_code == 201:
-                log = response.json()
-                print(f"   ✅ Logged completion for {completion_date}")
-            else:
-                print(f"   ❌ Failed to log completion: {response.status_code}")
-        
-        # Log completion for today
-        today_log = {
-            "completed_date": date.today().isoformat(),
-            "count": 1,
-            "notes": "Today's workout - feeling strong!"
-        }
-        
-        response = requests.post(f"{BASE_URL}/habits/{habit_id}/logs", json=today_log)
-        if response.status_code == 201:
-            print(f"   ✅ Logged completion for today!")
-        
-        # Test 3: Check updated habit with streak
-        print(f"\n🔥 TEST 3: Checking habit with calculated streak...")
-        response = requests.get(f"{BASE_URL}/habits/{habit_id}")
-        if response.status_code == 200:
-            updated_habit = response.json()
-            print(f"✅ Habit streak updated!")
-            print(f"   Current Streak: {updated_habit['current_streak']} days 🔥")
-            print(f"   Longest Streak: {updated_habit['longest_streak']} days 🏆")
-        else:
-            print(f"❌ Failed to get updated habit: {response.status_code}")
-        
-        # Test 4: Get completion history
-        print(f"\n📋 TEST 4: Getting completion history...")
-        response = requests.get(f"{BASE_URL}/habits/{habit_id}/logs")
-        if response.status_code == 200:
-            logs = response.json()
-            print(f"✅ Found {len(logs)} completion logs:")
-            for log in logs:
-                print(f"   • {log['completed_date']}: {log['count']}x - {log['notes']}")
-        else:
-            print(f"❌ Failed to get logs: {response.status_code}")
-        
-        # Test 5: Get detailed statistics
-        print(f"\n📊 TEST 5: Getting habit statistics...")
-        response = requests.get(f"{BASE_URL}/habits/{habit_id}/stats")
-        if response.status_code == 200:
-            stats = response.json()
-            print(f"✅ Habit Statistics:")
-            print(f"   Total Completions: {stats['total_completions']}")
-            print(f"   Completion Rate: {stats['completion_rate']}%")
-            print(f"   Current Streak: {stats['current_streak']} days")
-            print(f"   Longest Streak: {stats['longest_streak']} days")
-            print(f"   Days Since Creation: {stats['days_since_creation']}")
-            print(f"   Last Completed: {stats['last_completed']}")
-        else:
-            print(f"❌ Failed to get statistics: {response.status_code}")
-        
-        # Test 6: Get all habits
-        print(f"\n📝 TEST 6: Getting all habits...")
-        response = requests.get(f"{BASE_URL}/habits")
-        if response.status_code == 200:
-            habits = response.json()
-            print(f"✅ Found {len(habits)} habits:")
-            for habit in habits:
-                print(f"   • {habit['name']} - {habit['current_streak']} day streak")
-        else:
-            print(f"❌ Failed to get habits: {response.status_code}")
-        
-        # Test 7: Get overall statistics
-        print(f"\n🏆 TEST 7: Getting overall habit statistics...")
-        response = requests.get(f"{BASE_URL}/habits/stats/summary")
-        if response.status_code == 200:
-            overall_stats = response.json()
-            print(f"✅ Overall Statistics:")
-            print(f"   Total Habits: {overall_stats['total_habits']}")
-            print(f"   Active Habits: {overall_stats['active_habits']}")
-            print(f"   Total Completions: {overall_stats['total_completions']}")
-            print(f"   Best Current Streak: {overall_stats['best_current_streak']} days")
-        else:
-            print(f"❌ Failed to get overall statistics: {response.status_code}")
-        
-        # Test 8: Test streak break (skip a day)
-        print(f"\n💔 TEST 8: Testing streak break (skip tomorrow)...")
-        print("   (Skipping tomorrow to see how streaks handle gaps)")
-        
-        # Log completion for day after tomorrow
-        future_date = (date.today() + timedelta(days=2)).isoformat()
-        future_log = {
-            "completed_date": future_date,
-            "count": 1,
-            "notes": "Back after missing a day"
-        }
-        
-        response = requests.post(f"{BASE_URL}/habits/{habit_id}/logs", json=future_log)
-        if response.status_code == 201:
-            print(f"   ✅ Logged completion for {future_date}")
-            
-            # Check streak after gap
-            response = requests.get(f"{BASE_URL}/habits/{habit_id}")
-            if response.status_code == 200:
-                habit_after_gap = response.json()
-                print(f"   📊 Streak after gap:")
-                print(f"      Current Streak: {habit_after_gap['current_streak']} days")
-                print(f"      Longest Streak: {habit_after_gap['longest_streak']} days")
-                print("   💡 Current streak reset due to gap, but longest streak preserved!")
-        
-        # Test 9: Update habit
-        print(f"\n✏️ TEST 9: Updating habit...")
-        update_data = {
-            "target_count": 2,
-            "description": "Updated: 45 minutes of cardio and strength training"
-        }
-        response = requests.put(f"{BASE_URL}/habits/{habit_id}", json=update_data)
-        if response.status_code == 200:
-            updated_habit = response.json()
-            print(f"✅ Habit updated successfully!")
-            print(f"   New Target Count: {updated_habit['target_count']}")
-            print(f"   New Description: {updated_habit['description']}")
-        else:
-            print(f"❌ Failed to update habit: {response.status_code}")
-        
-        # Test 10: Clean up - delete habit
-        print(f"\n🗑️ TEST 10: Cleaning up - deleting habit...")
-        response = requests.delete(f"{BASE_URL}/habits/{habit_id}")
-        if response.status_code == 204:
-            print(f"✅ Habit deleted successfully!")
-        else:
-            print(f"❌ Failed to delete habit: {response.status_code}")
+        steps = [
+            lambda: test_log_completions(session, habit_id, today),
+            lambda: test_streak(session, habit_id),
+            lambda: test_history(session, habit_id),
+            lambda: test_stats(session, habit_id),
+            lambda: test_all_habits(session),
+            lambda: test_overall_stats(session),
+            lambda: test_streak_break(session, habit_id, today),
+            lambda: test_update(session, habit_id),
+            lambda: test_delete(session, habit_id),
+        ]
+        for step in steps:
+            try:
+                step()
+            except AssertionError as e:
+                print(f"❌ {e}")
         
         print("\n🎉 ALL HABIT TESTS COMPLETED!")
         print("Your Habit Tracking System is working perfectly! 🚀")
@@ -222,10 +315,14 @@ def show_habit_api_documentation():
     print("• PUT    /api/v1/habits/{id}      - Update habit")
     print("• DELETE /api/v1/habits/{id}      - Delete habit")
     print("• POST   /api/v1/habits/{id}/logs - Log completion 🔥")
+    print("• POST   /api/v1/habits/{id}/logs/bulk - Log several completions")
     print("• GET    /api/v1/habits/{id}/logs - Get history")
     print("• GET    /api/v1/habits/{id}/stats - Get statistics")
     print("• GET    /api/v1/habits/stats/summary - Overall stats")
 
 if __name__ == "__main__":
-    test_habit_api()
+    try:
+        run_habit_tests(SESSION)
+    finally:
+        SESSION.close()
     show_habit_api_documentation()
\ No newline at end of file
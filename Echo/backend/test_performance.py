@@ -6,10 +6,14 @@ and ensure the application meets performance requirements.
 """
 import asyncio
 import time
-import statistics
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from uuid import uuid4
 import logging
+from sqlalchemy import select, func
+from sqlalchemy.orm import load_only
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,11 +25,10 @@ from app.services.task_service import TaskService
 from app.services.habit_service import HabitService
 from app.services.analytics_service import AnalyticsService
 from app.models.task import Task
-from app.models.habit import Habit
+from app.models.habit import Habit, HabitLog
 from app.models.enums import TaskStatus, TaskPriority, HabitFrequency
-from app.schemas.task import TaskCreate
-from app.schemas.habit import HabitCreate
-from app.core.benchmarks import benchmark, DatabaseBenchmark
+from app.core.benchmarks import benchmark, DatabaseBenchmark, RunningStats
+from app.core.cache import invalidate_analytics_cache
 
 
 class PerformanceTestSuite:
@@ -38,38 +41,53 @@ class PerformanceTestSuite:
         self.analytics_service = AnalyticsService(self.db)
         self.db_benchmark = DatabaseBenchmark(self.db)
         
-        # Test data
-        self.test_tasks = []
-        self.test_habits = []
+        # Ids of the rows created for this run
+        self.test_task_ids = []
+        self.test_habit_ids = []
     
     def setup_test_data(self, num_tasks: int = 1000, num_habits: int = 50):
         """Create test data for performance testing"""
         logger.info(f"Creating {num_tasks} test tasks and {num_habits} test habits...")
         
-        # Create test tasks
-        for i in range(num_tasks):
-            task_data = TaskCreate(
-                title=f"Test Task {i}",
-                description=f"Description for test task {i}",
-                priority=TaskPriority.MEDIUM if i % 3 == 0 else TaskPriority.HIGH,
-                status=TaskStatus.COMPLETED if i % 4 == 0 else TaskStatus.TODO
-            )
-            
-            with benchmark.measure(f"create_task_{i}"):
-                task = self.task_service.create_task(task_data)
-                self.test_tasks.append(task)
-        
-        # Create test habits
-        for i in range(num_habits):
-            habit_data = HabitCreate(
-                name=f"Test Habit {i}",
-                description=f"Description for test habit {i}",
-                frequency=HabitFrequency.DAILY if i % 2 == 0 else HabitFrequency.WEEKLY
-            )
-            
-            with benchmark.measure(f"create_habit_{i}"):
-                habit = self.habit_service.create_habit(habit_data)
-                self.test_habits.append(habit)
+        # Rows are built before any timer starts so only the inserts are measured.
+        # Ids are generated here so the rows can be tracked without reading them back.
+        task_rows = [
+            {
+                "id": str(uuid4()),
+                "title": "Test Task " + number,
+                "description": "Description for test task " + number,
+                "priority": TaskPriority.MEDIUM if i % 3 == 0 else TaskPriority.HIGH,
+                "status": TaskStatus.COMPLETED if i % 4 == 0 else TaskStatus.TODO
+            }
+            for i, number in enumerate(map(str, range(num_tasks)))
+        ]
+        habit_rows = [
+            {
+                "id": str(uuid4()),
+                "name": "Test Habit " + number,
+                "description": "Description for test habit " + number,
+                "frequency": HabitFrequency.DAILY if i % 2 == 0 else HabitFrequency.WEEKLY
+            }
+            for i, number in enumerate(map(str, range(num_habits)))
+        ]
+        
+        # Bulk inserts skip the identity map and per-row commits; each is
+        # timed once and recorded as an aggregate over its rows
+        start = time.perf_counter_ns()
+        self.db.bulk_insert_mappings(Task, task_rows)
+        self.db.commit()
+        benchmark.record("bulk_create_tasks", (time.perf_counter_ns() - start) / 1e9, iterations=num_tasks)
+        
+        start = time.perf_counter_ns()
+        self.db.bulk_insert_mappings(Habit, habit_rows)
+        self.db.commit()
+        benchmark.record("bulk_create_habits", (time.perf_counter_ns() - start) / 1e9, iterations=num_habits)
+        
+        # Bulk inserts bypass the services, so drop stale analytics by hand
+        invalidate_analytics_cache()
+        
+        self.test_task_ids = [row["id"] for row in task_rows]
+        self.test_habit_ids = [row["id"] for row in habit_rows]
         
         logger.info("Test data created successfully")
     
@@ -95,16 +113,16 @@ class PerformanceTestSuite:
             search_results = self.task_service.get_all_tasks(search="Test")
         
         # Test individual task operations
-        if self.test_tasks:
-            test_task = self.test_tasks[0]
+        if self.test_task_ids:
+            test_task_id = self.test_task_ids[0]
             
             with benchmark.measure("get_task_by_id"):
-                retrieved_task = self.task_service.get_task_by_id(test_task.id)
+                retrieved_task = self.task_service.get_task_by_id(test_task_id)
             
             with benchmark.measure("update_task"):
                 from app.schemas.task import TaskUpdate
                 update_data = TaskUpdate(description="Updated description")
-                updated_task = self.task_service.update_task(test_task.id, update_data)
+                updated_task = self.task_service.update_task(test_task_id, update_data)
         
         logger.info("Task operations performance test completed")
     
@@ -113,22 +131,31 @@ class PerformanceTestSuite:
         logger.info("Testing analytics performance...")
         
         end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=30)
-        
-        # Test productivity overview (most expensive operation)
-        with benchmark.measure("analytics_productivity_overview"):
-            overview = self.analytics_service.get_productivity_overview(start_date, end_date)
-        
-        # Test with different date ranges
-        with benchmark.measure("analytics_7_days"):
-            week_overview = self.analytics_service.get_productivity_overview(
-                end_date - timedelta(days=7), end_date
+        month_start = end_date - timedelta(days=30)
+        week_start = end_date - timedelta(days=7)
+        quarter_start = end_date - timedelta(days=90)
+        
+        def overview(name: str, start_date: date) -> Dict[str, Any]:
+            """Compute one window on its own pooled session"""
+            db = SessionLocal()
+            try:
+                with benchmark.measure(name):
+                    return AnalyticsService(db).get_productivity_overview(start_date, end_date)
+            finally:
+                db.close()
+        
+        async def run_windows():
+            # The windows are independent aggregations, so let their queries overlap
+            return await asyncio.gather(
+                # Productivity overview (most expensive operation)
+                asyncio.to_thread(overview, "analytics_productivity_overview", month_start),
+                # Different date ranges
+                asyncio.to_thread(overview, "analytics_7_days", week_start),
+                asyncio.to_thread(overview, "analytics_90_days", quarter_start),
             )
         
-        with benchmark.measure("analytics_90_days"):
-            quarter_overview = self.analytics_service.get_productivity_overview(
-                end_date - timedelta(days=90), end_date
-            )
+        with benchmark.measure("analytics_all_ranges"):
+            overview_30, week_overview, quarter_overview = asyncio.run(run_windows())
         
         logger.info("Analytics performance test completed")
     
@@ -146,16 +173,18 @@ class PerformanceTestSuite:
         
         crud_results = self.db_benchmark.benchmark_crud_operations(Task, sample_task_data)
         
-        # Test bulk operations
+        # Test bulk operations (ids only - the rows themselves are not used)
         with benchmark.measure("bulk_task_query"):
-            tasks = self.db.query(Task).limit(500).all()
+            task_ids = self.db.execute(select(Task.id).limit(500)).scalars().all()
         
         with benchmark.measure("bulk_task_count"):
-            task_count = self.db.query(Task).count()
+            task_count = self.db.execute(select(func.count()).select_from(Task)).scalar()
         
         # Test complex queries
         with benchmark.measure("complex_task_query"):
-            complex_results = self.db.query(Task).filter(
+            complex_results = self.db.query(Task).options(
+                load_only(Task.id, Task.title, Task.created_at)
+            ).filter(
                 Task.status == TaskStatus.COMPLETED,
                 Task.priority.in_([TaskPriority.HIGH, TaskPriority.URGENT])
             ).order_by(Task.created_at.desc()).limit(100).all()
@@ -166,85 +195,95 @@ class PerformanceTestSuite:
         """Test performance under concurrent load"""
         logger.info(f"Testing concurrent operations with {num_concurrent} threads...")
         
-        import threading
-        import queue
-        
-        results_queue = queue.Queue()
+        first_task_id = self.test_task_ids[0] if self.test_task_ids else None
         
         def worker():
-            """Worker function for concurrent testing"""
-            start_time = time.time()
+            """Worker function for concurrent testing, on its own pooled session"""
+            start_time = time.perf_counter()
+            db = SessionLocal()
+            try:
+                task_service = TaskService(db)
+                
+                # Perform various operations
+                tasks = task_service.get_all_tasks(limit=50)
+                
+                if first_task_id:
+                    task = task_service.get_task_by_id(first_task_id)
+            finally:
+                db.close()
             
-            # Perform various operations
-            tasks = self.task_service.get_all_tasks(limit=50)
-            
-            if self.test_tasks:
-                task = self.task_service.get_task_by_id(self.test_tasks[0].id)
-            
-            end_time = time.time()
-            results_queue.put(end_time - start_time)
+            return time.perf_counter() - start_time
         
-        # Start concurrent workers
-        threads = []
-        start_time = time.time()
+        # Run concurrent workers
+        start_time = time.perf_counter()
         
-        for i in range(num_concurrent):
-            thread = threading.Thread(target=worker)
-            thread.start()
-            threads.append(thread)
+        with ThreadPoolExecutor(max_workers=num_concurrent) as executor:
+            futures = [executor.submit(worker) for _ in range(num_concurrent)]
+            # One pass over the results as they are collected
+            execution_stats = RunningStats()
+            for future in futures:
+                execution_stats.update(future.result())
         
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        total_time = time.perf_counter() - start_time
         
-        total_time = time.time() - start_time
-        
-        # Collect results
-        execution_times = []
-        while not results_queue.empty():
-            execution_times.append(results_queue.get())
-        
-        if execution_times:
-            avg_time = statistics.mean(execution_times)
-            max_time = max(execution_times)
-            min_time = min(execution_times)
-            
+        if execution_stats.count:
             logger.info(f"Concurrent test results:")
             logger.info(f"  Total time: {total_time:.3f}s")
-            logger.info(f"  Average operation time: {avg_time:.3f}s")
-            logger.info(f"  Min/Max operation time: {min_time:.3f}s / {max_time:.3f}s")
+            logger.info(f"  Average operation time: {execution_stats.mean:.3f}s (±{execution_stats.stdev:.3f}s)")
+            logger.info(f"  Min/Max operation time: {execution_stats.min_time:.3f}s / {execution_stats.max_time:.3f}s")
             logger.info(f"  Operations per second: {num_concurrent / total_time:.2f}")
     
     def test_memory_usage(self):
         """Test memory usage patterns"""
         logger.info("Testing memory usage...")
         
+        # RSS (when psutil is installed) is only a coarse sanity check;
+        # tracemalloc gives exact Python allocation deltas and peaks
         try:
             import psutil
             import os
-            
             process = psutil.Process(os.getpid())
-            initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+        except ImportError:
+            process = None
+            logger.warning("psutil not available, reporting tracemalloc figures only")
+        
+        initial_memory = process.memory_info().rss / 1024 / 1024 if process else None  # MB
+        
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            peaks = []
             
-            # Perform memory-intensive operations
+            # Perform memory-intensive operations. The overview is cached,
+            # so drop the cache first each time to measure the real work
             with benchmark.measure("memory_intensive_analytics"):
                 for i in range(10):
+                    invalidate_analytics_cache()
+                    tracemalloc.reset_peak()
                     overview = self.analytics_service.get_productivity_overview()
+                    peaks.append(tracemalloc.get_traced_memory()[1])
             
             # Force garbage collection
             import gc
             gc.collect()
             
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        
+        site_stats = after.compare_to(before, "lineno")
+        
+        logger.info(f"Memory usage:")
+        logger.info(f"  Allocated: {sum(stat.size_diff for stat in site_stats) / 1024:.1f} KB")
+        logger.info(f"  Peak per call: {max(peaks) / 1024:.1f} KB (mean {sum(peaks) / len(peaks) / 1024:.1f} KB)")
+        for stat in site_stats[:10]:
+            logger.info(f"    {stat}")
+        
+        if process:
             final_memory = process.memory_info().rss / 1024 / 1024  # MB
-            memory_delta = final_memory - initial_memory
-            
-            logger.info(f"Memory usage:")
-            logger.info(f"  Initial: {initial_memory:.2f} MB")
-            logger.info(f"  Final: {final_memory:.2f} MB")
-            logger.info(f"  Delta: {memory_delta:.2f} MB")
-            
-        except ImportError:
-            logger.warning("psutil not available, skipping memory usage test")
+            logger.info(f"  RSS initial: {initial_memory:.2f} MB")
+            logger.info(f"  RSS final: {final_memory:.2f} MB")
+            logger.info(f"  RSS delta: {final_memory - initial_memory:.2f} MB")
     
     def run_all_tests(self):
         """Run the complete performance test suite"""
@@ -324,25 +363,38 @@ class PerformanceTestSuite:
         
         print("\n" + "="*80)
     
-    def cleanup_test_data(self):
-        """Clean up test data"""
+    def cleanup_test_data(self, chunk_size: int = 1000):
+        """Clean up test data with one bulk DELETE per table"""
         logger.info("Cleaning up test data...")
         
+        task_ids = self.test_task_ids
+        habit_ids = self.test_habit_ids
+        
         try:
-            # Delete test tasks
-            for task in self.test_tasks:
-                self.task_service.delete_task(task.id)
+            # Chunked to stay under the database's bound-parameter limit
+            for i in range(0, len(task_ids), chunk_size):
+                self.db.query(Task).filter(
+                    Task.id.in_(task_ids[i:i + chunk_size])
+                ).delete(synchronize_session=False)
             
-            # Delete test habits
-            for habit in self.test_habits:
-                self.habit_service.delete_habit(habit.id)
+            # Habit logs go first, as delete_habit() does
+            for i in range(0, len(habit_ids), chunk_size):
+                chunk = habit_ids[i:i + chunk_size]
+                self.db.query(HabitLog).filter(
+                    HabitLog.habit_id.in_(chunk)
+                ).delete(synchronize_session=False)
+                self.db.query(Habit).filter(
+                    Habit.id.in_(chunk)
+                ).delete(synchronize_session=False)
             
+            self.db.commit()
+            invalidate_analytics_cache()
             logger.info("Test data cleanup completed")
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error during cleanup: {e}")
 
-
 def main():
     """Main function to run performance tests"""
     # Ensure database tables exist
@@ -1,6 +1,7 @@
 """
 Test PostgreSQL database with sample data
 """
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.models.task import Task
@@ -26,10 +27,6 @@ def test_database_operations():
             priority=TaskPriority.HIGH,
             due_date=datetime.now()
         )
-        db.add(test_task)
-        db.commit()
-        db.refresh(test_task)
-        print(f"✅ Task created with ID: {test_task.id}")
         
         # Test 2: Create a habit
         print("🎯 Creating a test habit...")
@@ -39,15 +36,19 @@ def test_database_operations():
             frequency=HabitFrequency.DAILY,
             target_count=1
         )
-        db.add(test_habit)
+        
+        # Both rows go in with a single commit
+        db.add_all([test_task, test_habit])
         db.commit()
+        db.refresh(test_task)
         db.refresh(test_habit)
+        print(f"✅ Task created with ID: {test_task.id}")
         print(f"✅ Habit created with ID: {test_habit.id}")
         
         # Test 3: Query data back
         print("🔍 Querying data from database...")
-        all_tasks = db.query(Task).all()
-        all_habits = db.query(Habit).all()
+        all_tasks = db.execute(select(Task)).scalars().all()
+        all_habits = db.execute(select(Habit)).scalars().all()
         
         print(f"📊 Found {len(all_tasks)} tasks in database")
         print(f"📊 Found {len(all_habits)} habits in database")
@@ -10,14 +10,23 @@ This script demonstrates how your API works by:
 
 Run this to see your API in action!
 """
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 from datetime import datetime, timedelta
 
+from script_utils import buffered_stdout
+
+
 # API base URL (when server is running)
 BASE_URL = "http://localhost:8000/api/v1"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Transport override for the pooled client; pytest swaps in the in-process app
+TRANSPORT = None
+
 
-def test_task_api():
+async def test_task_api():
     """Test all task API endpoints"""
     print("🧪 TESTING TASK MANAGEMENT API")
     print("=" * 50)
@@ -25,108 +34,16 @@ def test_task_api():
     print()
     
     try:
-        # Test 1: Create a new task
-        print("📝 TEST 1: Creating a new task...")
-        task_data = {
-            "title": "Learn FastAPI",
-            "description": "Master FastAPI for ECHO AI project",
-            "priority": "high",
-            "due_date": (datetime.now() + timedelta(days=7)).isoformat()
-        }
-        
-        response = requests.post(f"{BASE_URL}/tasks", json=task_data)
-        if response.status_code == 201:
-            created_task = response.json()
-            task_id = created_task["id"]
-            print(f"✅ Task created successfully!")
-            print(f"   ID: {task_id}")
-            print(f"   Title: {created_task['title']}")
-            print(f"   Status: {created_task['status']}")
-        else:
-            print(f"❌ Failed to create task: {response.status_code}")
-            return
-        
-        # Test 2: Get all tasks
-        print("\n📋 TEST 2: Getting all tasks...")
-        response = requests.get(f"{BASE_URL}/tasks")
-        if response.status_code == 200:
-            tasks = response.json()
-            print(f"✅ Found {len(tasks)} tasks:")
-            for task in tasks:
-                print(f"   • {task['title']} (Status: {task['status']})")
-        else:
-            print(f"❌ Failed to get tasks: {response.status_code}")
-        
-        # Test 3: Get specific task
-        print(f"\n🔍 TEST 3: Getting specific task by ID...")
-        response = requests.get(f"{BASE_URL}/tasks/{task_id}")
-        if response.status_code == 200:
-            task = response.json()
-            print(f"✅ Found task: {task['title']}")
-            print(f"   Created: {task['created_at']}")
-            print(f"   Due: {task['due_date']}")
-        else:
-            print(f"❌ Failed to get task: {response.status_code}")
-        
-        # Test 4: Update task (mark as completed)
-        print(f"\n✏️ TEST 4: Updating task (mark as completed)...")
-        update_data = {
-            "status": "completed",
-            "description": "Successfully learned FastAPI basics!"
-        }
-        response = requests.put(f"{BASE_URL}/tasks/{task_id}", json=update_data)
-        if response.status_code == 200:
-            updated_task = response.json()
-            print(f"✅ Task updated successfully!")
-            print(f"   Status: {updated_task['status']}")
-            print(f"   Completed at: {updated_task['completed_at']}")
-        else:
-            print(f"❌ Failed to update task: {response.status_code}")
-        
-        # Test 5: Get task statistics
-        print(f"\n📊 TEST 5: Getting task statistics...")
-        response = requests.get(f"{BASE_URL}/tasks/stats/summary")
-        if response.status_code == 200:
-            stats = response.json()
-            print(f"✅ Task Statistics:")
-            print(f"   Total: {stats['total']}")
-            print(f"   Completed: {stats['completed']}")
-            print(f"   Pending: {stats['pending']}")
-            print(f"   Overdue: {stats['overdue']}")
-        else:
-            print(f"❌ Failed to get statistics: {response.status_code}")
-        
-        # Test 6: Filter tasks by status
-        print(f"\n🔎 TEST 6: Filtering completed tasks...")
-        response = requests.get(f"{BASE_URL}/tasks?status=completed")
-        if response.status_code == 200:
-            completed_tasks = response.json()
-            print(f"✅ Found {len(completed_tasks)} completed tasks:")
-            for task in completed_tasks:
-                print(f"   • {task['title']} (Completed: {task['completed_at']})")
-        else:
-            print(f"❌ Failed to filter tasks: {response.status_code}")
-        
-        # Test 7: Delete task
-        print(f"\n🗑️ TEST 7: Deleting task...")
-        response = requests.delete(f"{BASE_URL}/tasks/{task_id}")
-        if response.status_code == 204:
-            print(f"✅ Task deleted successfully!")
-        else:
-            print(f"❌ Failed to delete task: {response.status_code}")
-        
-        # Verify deletion
-        print(f"\n🔍 TEST 8: Verifying task was deleted...")
-        response = requests.get(f"{BASE_URL}/tasks/{task_id}")
-        if response.status_code == 404:
-            print(f"✅ Confirmed: Task no longer exists")
-        else:
-            print(f"❌ Task still exists: {response.status_code}")
-        
-        print("\n🎉 ALL TESTS COMPLETED!")
-        print("Your Task Management API is working perfectly! 🚀")
+        # One pooled client for every step; paths below are relative to BASE_URL
+        async with httpx.AsyncClient(
+            base_url=BASE_URL,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0,
+            transport=TRANSPORT,
+        ) as client:
+            await run_task_steps(client)
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Connection Error!")
         print("Make sure the server is running:")
         print("   1. Open another terminal")
@@ -136,6 +53,119 @@ def test_task_api():
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
+async def run_task_steps(client):
+    """Run the task API steps, overlapping the reads that don't depend on each other"""
+    # Test 1: Create a new task
+    print("📝 TEST 1: Creating a new task...")
+    task_data = {
+        "title": "Learn FastAPI",
+        "description": "Master FastAPI for ECHO AI project",
+        "priority": "high",
+        "due_date": (datetime.now() + timedelta(days=7)).isoformat()
+    }
+    
+    response = await client.post("/tasks/", content=orjson.dumps(task_data), headers=JSON_HEADERS)
+    if response.status_code == 201:
+        created_task = response.json()
+        task_id = created_task["id"]
+        print(f"✅ Task created successfully!")
+        print(f"   ID: {task_id}")
+        print(f"   Title: {created_task['title']}")
+        print(f"   Status: {created_task['status']}")
+    else:
+        print(f"❌ Failed to create task: {response.status_code}")
+        return
+    
+    # Tests 2 and 3 only read the new task, so fetch them together
+    all_response, task_response = await asyncio.gather(
+        client.get("/tasks/"),
+        client.get(f"/tasks/{task_id}"),
+    )
+    
+    # Test 2: Get all tasks
+    print("\n📋 TEST 2: Getting all tasks...")
+    if all_response.status_code == 200:
+        tasks = all_response.json()
+        print(f"✅ Found {len(tasks)} tasks:")
+        for task in tasks:
+            print(f"   • {task['title']} (Status: {task['status']})")
+    else:
+        print(f"❌ Failed to get tasks: {all_response.status_code}")
+    
+    # Test 3: Get specific task
+    print(f"\n🔍 TEST 3: Getting specific task by ID...")
+    if task_response.status_code == 200:
+        task = task_response.json()
+        print(f"✅ Found task: {task['title']}")
+        print(f"   Created: {task['created_at']}")
+        print(f"   Due: {task['due_date']}")
+    else:
+        print(f"❌ Failed to get task: {task_response.status_code}")
+    
+    # Test 4: Update task (mark as completed)
+    print(f"\n✏️ TEST 4: Updating task (mark as completed)...")
+    update_data = {
+        "status": "completed",
+        "description": "Successfully learned FastAPI basics!"
+    }
+    response = await client.put(
+        f"/tasks/{task_id}", content=orjson.dumps(update_data), headers=JSON_HEADERS
+    )
+    if response.status_code == 200:
+        updated_task = response.json()
+        print(f"✅ Task updated successfully!")
+        print(f"   Status: {updated_task['status']}")
+        print(f"   Completed at: {updated_task['completed_at']}")
+    else:
+        print(f"❌ Failed to update task: {response.status_code}")
+    
+    # Tests 5 and 6 read the state after the update, so fetch them together
+    stats_response, completed_response = await asyncio.gather(
+        client.get("/tasks/stats/summary"),
+        client.get("/tasks/", params={"status": "completed"}),
+    )
+    
+    # Test 5: Get task statistics
+    print(f"\n📊 TEST 5: Getting task statistics...")
+    if stats_response.status_code == 200:
+        stats = stats_response.json()
+        print(f"✅ Task Statistics:")
+        print(f"   Total: {stats['total']}")
+        print(f"   Completed: {stats['completed']}")
+        print(f"   Pending: {stats['pending']}")
+        print(f"   Overdue: {stats['overdue']}")
+    else:
+        print(f"❌ Failed to get statistics: {stats_response.status_code}")
+    
+    # Test 6: Filter tasks by status
+    print(f"\n🔎 TEST 6: Filtering completed tasks...")
+    if completed_response.status_code == 200:
+        completed_tasks = completed_response.json()
+        print(f"✅ Found {len(completed_tasks)} completed tasks:")
+        for task in completed_tasks:
+            print(f"   • {task['title']} (Completed: {task['completed_at']})")
+    else:
+        print(f"❌ Failed to filter tasks: {completed_response.status_code}")
+    
+    # Test 7: Delete task
+    print(f"\n🗑️ TEST 7: Deleting task...")
+    response = await client.delete(f"/tasks/{task_id}")
+    if response.status_code == 204:
+        print(f"✅ Task deleted successfully!")
+    else:
+        print(f"❌ Failed to delete task: {response.status_code}")
+    
+    # Verify deletion
+    print(f"\n🔍 TEST 8: Verifying task was deleted...")
+    response = await client.get(f"/tasks/{task_id}")
+    if response.status_code == 404:
+        print(f"✅ Confirmed: Task no longer exists")
+    else:
+        print(f"❌ Task still exists: {response.status_code}")
+    
+    print("\n🎉 ALL TESTS COMPLETED!")
+    print("Your Task Management API is working perfectly! 🚀")
+
 def show_api_documentation():
     """Show how to explore the API documentation"""
     print("\n📚 EXPLORE YOUR API:")
@@ -153,5 +183,7 @@ def show_api_documentation():
     print("• GET    /api/v1/tasks/stats/summary - Get statistics")
 
 if __name__ == "__main__":
-    test_task_api()
-    show_api_documentation()
\ No newline at end of file
+    # The run is short, so its progress lines are written out in one go
+    with buffered_stdout():
+        asyncio.run(test_task_api())
+        show_api_documentation()
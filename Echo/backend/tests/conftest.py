@@ -0,0 +1,133 @@
+"""
+Shared fixtures for the service unit tests
+
+Every test module here runs against one in-memory SQLite database per
+test session. The schema is created once; each test then runs inside a
+transaction that is rolled back afterwards, so tests never see each
+other's rows and nothing has to be dropped or deleted between them.
+"""
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import configure_mappers, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.models import Base
+
+# Resolve every mapper and relationship up front, rather than inside
+# whichever test happens to run the first query
+configure_mappers()
+
+# StaticPool keeps the one connection (and so the database) alive for the
+# whole test session; every pytest-xdist worker process gets its own.
+TEST_DATABASE_URL = "sqlite://"
+
+# autoflush is off (as in the app's SessionLocal), so pending rows are
+# only flushed on commit, never once per query while seeding. Nothing
+# changes rows behind the session's back in these tests, so loaded
+# objects also stay valid after a commit and need no reload.
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+def _fast_sqlite_pragmas(dbapi_connection, connection_record):
+    """Skip fsyncs, journal and lock bookkeeping (test-only, unsafe for real data)"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Let SQLAlchemy issue BEGIN itself so SAVEPOINTs work under pysqlite"""
+    dbapi_connection.isolation_level = None
+
+
+def _begin_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+def compile_schema_script(dialect):
+    """Compile every model's CREATE TABLE (and CREATE INDEX) into one SQL script"""
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes
+        )
+    return ";\n".join(statements) + ";"
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """One in-memory engine for every test in the session"""
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    event.listen(engine, "connect", _fast_sqlite_pragmas)
+    event.listen(engine, "connect", _disable_pysqlite_transactions)
+    event.listen(engine, "begin", _begin_transaction)
+
+    try:
+        yield engine
+    finally:
+        # No drop_all: the in-memory database disappears with the connection
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def tables(engine):
+    """
+    Create the schema once per test session
+
+    The DDL is compiled once and run with a single sqlite3 executescript
+    call, instead of create_all inspecting and creating table by table.
+    """
+    connection = engine.raw_connection()
+    try:
+        connection.driver_connection.executescript(compile_schema_script(engine.dialect))
+    finally:
+        connection.close()
+    return engine
+
+
+@pytest.fixture
+def db_session(tables):
+    """
+    Give each test a clean database
+
+    The test runs inside a transaction that is rolled back afterwards;
+    the services' own commits only release SAVEPOINTs within it.
+    """
+    connection = tables.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def seed(db_session):
+    """
+    Insert rows directly, bypassing the services
+
+    seed(Model, {...}, {...}) runs one Core INSERT and one commit, and
+    returns the new primary keys in the order the rows were given.
+    """
+    def seed_rows(model, *rows):
+        ids = db_session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            list(rows)
+        ).all()
+        db_session.commit()
+        return ids
+
+    return seed_rows
@@ -11,33 +11,12 @@ These tests verify that our HabitService works correctly:
 The streak calculation is the most complex part to test!
 """
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime, date, timedelta
 
-from app.core.database import Base
 from app.services.habit_service import HabitService
 from app.schemas.habit import HabitCreate, HabitUpdate, HabitLogCreate
 from app.models.enums import HabitFrequency
-
-
-# Create in-memory SQLite database for testing
-TEST_DATABASE_URL = "sqlite:///./test_habits.db"
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-@pytest.fixture
-def db_session():
-    """Create a fresh database for each test"""
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
-    
-    try:
-        yield session
-    finally:
-        session.close()
-        Base.metadata.drop_all(bind=engine)
+from app.models.habit import Habit
 
 
 @pytest.fixture
@@ -47,8 +26,14 @@ def habit_service(db_session):
 
 
 @pytest.fixture
+def today():
+    """One clock read per test, so every date in it agrees"""
+    return date.today()
+
+
+@pytest.fixture(scope="module")
 def sample_habit_data():
-    """Sample habit data for testing"""
+    """Sample habit data for testing (validated once; tests only read it)"""
     return HabitCreate(
         name="Morning Exercise",
         description="30 minutes of cardio",
@@ -57,6 +42,23 @@ def sample_habit_data():
     )
 
 
+def log_days(habit_service, habit_id, today, days_ago):
+    """
+    Log one completion per day offset with a single bulk call
+    
+    Everything is flushed by the one commit inside log_habit_completions,
+    and streaks are recomputed only once, after the whole batch.
+    """
+    return habit_service.log_habit_completions(habit_id, [
+        HabitLogCreate(
+            habit_id=habit_id,
+            completed_date=today - timedelta(days=i),
+            count=1
+        )
+        for i in days_ago
+    ])
+
+
 class TestHabitService:
     """Test class for HabitService functionality"""
     
@@ -95,18 +97,14 @@ class TestHabitService:
         non_existent = habit_service.get_habit_by_id("non-existent-id")
         assert non_existent is None
     
-    def test_get_all_habits(self, habit_service):
+    def test_get_all_habits(self, habit_service, seed):
         """Test getting all habits with filtering"""
         # Create multiple habits
-        daily_habit = habit_service.create_habit(HabitCreate(
-            name="Daily Exercise",
-            frequency=HabitFrequency.DAILY
-        ))
-        
-        weekly_habit = habit_service.create_habit(HabitCreate(
-            name="Weekly Grocery Shopping",
-            frequency=HabitFrequency.WEEKLY
-        ))
+        seed(
+            Habit,
+            {"name": "Daily Exercise", "frequency": HabitFrequency.DAILY},
+            {"name": "Weekly Grocery Shopping", "frequency": HabitFrequency.WEEKLY}
+        )
         
         # Test getting all habits
         all_habits = habit_service.get_all_habits()
@@ -159,7 +157,7 @@ class TestHabitService:
         success = habit_service.delete_habit("non-existent-id")
         assert success is False
     
-    def test_log_habit_completion(self, habit_service, sample_habit_data):
+    def test_log_habit_completion(self, habit_service, sample_habit_data, today):
         """
         Test logging habit completions
         
@@ -173,7 +171,7 @@ class TestHabitService:
         # Log first completion
         log_data = HabitLogCreate(
             habit_id=habit.id,
-            completed_date=date.today(),
+            completed_date=today,
             count=1,
             notes="First completion!"
         )
@@ -181,7 +179,7 @@ class TestHabitService:
         log = habit_service.log_habit_completion(log_data)
         assert log is not None
         assert log.habit_id == habit.id
-        assert log.completed_date == date.today()
+        assert log.completed_date == today
         assert log.count == 1
         assert log.notes == "First completion!"
         
@@ -193,125 +191,97 @@ class TestHabitService:
         # Test logging for non-existent habit
         bad_log = HabitLogCreate(
             habit_id="non-existent-id",
-            completed_date=date.today(),
+            completed_date=today,
             count=1
         )
         result = habit_service.log_habit_completion(bad_log)
         assert result is None
-    
-    def test_streak_calculation_consecutive_days(self, habit_service, sample_habit_data):
-        """
-        Test streak calculation with consecutive days
-        
-        This is the core algorithm test!
-        """
-        habit = habit_service.create_habit(sample_habit_data)
-        
-        # Log completions for 5 consecutive days ending today
-        for i in range(4, -1, -1):  # 4 days ago to today
-            completion_date = date.today() - timedelta(days=i)
-            log_data = HabitLogCreate(
-                habit_id=habit.id,
-                completed_date=completion_date,
-                count=1
-            )
-            habit_service.log_habit_completion(log_data)
-        
-        # Check streak
-        updated_habit = habit_service.get_habit_by_id(habit.id)
-        assert updated_habit.current_streak == 5
-        assert updated_habit.longest_streak == 5
-    
-    def test_streak_calculation_with_gap(self, habit_service, sample_habit_data):
+
+    def test_log_habit_completions_bulk(self, habit_service, sample_habit_data, today):
         """
-        Test streak calculation when there's a gap
-        
+        Test logging several completions at once
+
         Verifies:
-        - Current streak resets after gap
-        - Longest streak is preserved
+        - Every date is saved in one call
+        - An already-logged date is updated, not duplicated
+        - Streaks are calculated for the whole batch
         """
         habit = habit_service.create_habit(sample_habit_data)
-        
-        # Log completions for 3 days, then skip a day, then 2 more days
-        # Days: [today-5, today-4, today-3, SKIP today-2, today-1, today]
-        
-        # First streak: 3 days
-        for i in range(5, 2, -1):  # 5, 4, 3 days ago
-            completion_date = date.today() - timedelta(days=i)
-            log_data = HabitLogCreate(
-                habit_id=habit.id,
-                completed_date=completion_date,
-                count=1
-            )
-            habit_service.log_habit_completion(log_data)
-        
-        # Skip day (today-2)
-        
-        # Second streak: 2 days (yesterday and today)
-        for i in range(1, -1, -1):  # 1 day ago and today
-            completion_date = date.today() - timedelta(days=i)
-            log_data = HabitLogCreate(
+        habit_service.log_habit_completion(HabitLogCreate(
+            habit_id=habit.id,
+            completed_date=today,
+            count=1
+        ))
+
+        # 2 days ago to today, computed once for the payload and the check
+        dates = [today - timedelta(days=i) for i in (2, 1, 0)]
+        logs_data = [
+            HabitLogCreate(
                 habit_id=habit.id,
-                completed_date=completion_date,
-                count=1
+                completed_date=completed_date,
+                count=2 if completed_date == today else 1,
+                notes=f"Day {(today - completed_date).days}"
             )
-            habit_service.log_habit_completion(log_data)
-        
-        # Check streaks
+            for completed_date in dates
+        ]
+        logs = habit_service.log_habit_completions(habit.id, logs_data)
+
+        assert [log.completed_date for log in logs] == dates
+        assert logs[-1].count == 2
+        assert len(habit_service.get_habit_logs(habit.id)) == 3
+
         updated_habit = habit_service.get_habit_by_id(habit.id)
-        assert updated_habit.current_streak == 2  # Current streak from yesterday-today
-        assert updated_habit.longest_streak == 3  # Best streak was the first 3 days
-    
-    def test_streak_calculation_no_recent_activity(self, habit_service, sample_habit_data):
+        assert updated_habit.current_streak == 3
+        assert updated_habit.longest_streak == 3
+
+        # Non-existent habit
+        assert habit_service.log_habit_completions("non-existent-id", logs_data) is None
+
+    @pytest.mark.parametrize("days_ago, expected_current, expected_longest", [
+        # 5 consecutive days ending today
+        pytest.param(range(4, -1, -1), 5, 5, id="consecutive_days"),
+        # 3 days, skip today-2, then yesterday and today: current streak
+        # resets after the gap, longest streak is preserved
+        pytest.param([5, 4, 3, 1, 0], 2, 3, id="with_gap"),
+        # Last completion 3 days ago: no current streak, but it counted once
+        pytest.param([3], 0, 1, id="no_recent_activity"),
+    ])
+    def test_streak_calculation(
+        self, habit_service, sample_habit_data, today, days_ago, expected_current, expected_longest
+    ):
         """
-        Test streak when last completion was not recent
+        Test streak calculation for different completion histories
         
-        If last completion was 3 days ago, current streak should be 0
+        This is the core algorithm test!
         """
         habit = habit_service.create_habit(sample_habit_data)
+        log_days(habit_service, habit.id, today, days_ago)
         
-        # Log completion 3 days ago
-        old_date = date.today() - timedelta(days=3)
-        log_data = HabitLogCreate(
-            habit_id=habit.id,
-            completed_date=old_date,
-            count=1
-        )
-        habit_service.log_habit_completion(log_data)
-        
-        # Check streak
+        # Check streaks
         updated_habit = habit_service.get_habit_by_id(habit.id)
-        assert updated_habit.current_streak == 0  # No recent activity
-        assert updated_habit.longest_streak == 1  # But we did complete it once
+        assert updated_habit.current_streak == expected_current
+        assert updated_habit.longest_streak == expected_longest
     
-    def test_get_habit_logs(self, habit_service, sample_habit_data):
+    def test_get_habit_logs(self, habit_service, sample_habit_data, today):
         """Test getting habit completion logs"""
         habit = habit_service.create_habit(sample_habit_data)
         
         # Log several completions
-        for i in range(3):
-            completion_date = date.today() - timedelta(days=i)
-            log_data = HabitLogCreate(
-                habit_id=habit.id,
-                completed_date=completion_date,
-                count=1,
-                notes=f"Day {i+1}"
-            )
-            habit_service.log_habit_completion(log_data)
+        log_days(habit_service, habit.id, today, range(3))
         
         # Get all logs
         logs = habit_service.get_habit_logs(habit.id)
         assert len(logs) == 3
         
         # Test date filtering
-        yesterday = date.today() - timedelta(days=1)
+        yesterday = today - timedelta(days=1)
         recent_logs = habit_service.get_habit_logs(
             habit.id,
             start_date=yesterday
         )
         assert len(recent_logs) == 2  # Yesterday and today
     
-    def test_get_habit_statistics(self, habit_service, sample_habit_data):
+    def test_get_habit_statistics(self, habit_service, sample_habit_data, today):
         """
         Test habit statistics calculation
         
@@ -326,7 +296,7 @@ class TestHabitService:
         # Log completion for today only (since habit was just created)
         log_data = HabitLogCreate(
             habit_id=habit.id,
-            completed_date=date.today(),
+            completed_date=today,
             count=1
         )
         habit_service.log_habit_completion(log_data)
@@ -339,32 +309,23 @@ class TestHabitService:
         assert stats["habit_name"] == habit.name
         assert stats["total_completions"] == 1
         assert stats["current_streak"] == 1
-        assert stats["last_completed"] == date.today()
+        assert stats["last_completed"] == today
         
         # Completion rate should be 100% (1 completion on day 1)
         assert stats["completion_rate"] == 100.0
     
-    def test_get_all_habits_statistics(self, habit_service):
+    def test_get_all_habits_statistics(self, habit_service, seed, today):
         """Test overall habit statistics"""
         # Create multiple habits
-        habit1 = habit_service.create_habit(HabitCreate(
-            name="Exercise",
-            frequency=HabitFrequency.DAILY
-        ))
-        
-        habit2 = habit_service.create_habit(HabitCreate(
-            name="Reading",
-            frequency=HabitFrequency.DAILY
-        ))
+        habit_ids = seed(
+            Habit,
+            {"name": "Exercise", "frequency": HabitFrequency.DAILY},
+            {"name": "Reading", "frequency": HabitFrequency.DAILY}
+        )
         
         # Log completions for both habits
-        for habit in [habit1, habit2]:
-            log_data = HabitLogCreate(
-                habit_id=habit.id,
-                completed_date=date.today(),
-                count=1
-            )
-            habit_service.log_habit_completion(log_data)
+        for habit_id in habit_ids:
+            log_days(habit_service, habit_id, today, [0])
         
         # Get overall statistics
         stats = habit_service.get_all_habits_statistics()
@@ -374,7 +335,7 @@ class TestHabitService:
         assert stats["total_completions"] == 2
         assert stats["best_current_streak"] == 1
     
-    def test_duplicate_completion_handling(self, habit_service, sample_habit_data):
+    def test_duplicate_completion_handling(self, habit_service, sample_habit_data, today):
         """
         Test that logging the same date twice updates the existing log
         """
@@ -383,7 +344,7 @@ class TestHabitService:
         # Log first completion
         log_data = HabitLogCreate(
             habit_id=habit.id,
-            completed_date=date.today(),
+            completed_date=today,
             count=1,
             notes="First log"
         )
@@ -392,7 +353,7 @@ class TestHabitService:
         # Log same date again with different data
         log_data_update = HabitLogCreate(
             habit_id=habit.id,
-            completed_date=date.today(),
+            completed_date=today,
             count=2,
             notes="Updated log"
         )
@@ -412,6 +373,8 @@ class TestHabitService:
 """
 1. Run tests: pytest tests/test_habit_service.py -v
 2. See detailed output with explanations
+3. Run in parallel: pytest -n auto tests/test_habit_service.py
+   (each xdist worker is its own process with its own in-memory database)
 
 These tests ensure your habit tracking and streak calculation
 algorithms work correctly and handle all edge cases!
@@ -0,0 +1,39 @@
+"""
+Unit Tests for the Local AI Client
+
+These run against a mock Ollama transport, so no Ollama server is needed.
+"""
+import asyncio
+
+import httpx
+
+from app.services.local_ai_client import LocalAIClient
+
+TAGS = {"models": [{"name": "gemma2:2b"}, {"name": "llama3.2:1b"}]}
+
+
+def test_concurrent_lookups_share_one_tags_request():
+    """is_available, list_models and the fastest-model lookup hit /api/tags once"""
+    tags_requests = []
+
+    async def ollama(request):
+        tags_requests.append(request.url.path)
+        # Yield to the loop so the other lookups run while this one is in flight
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=TAGS)
+
+    async def run_lookups():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(ollama)) as http_client:
+            client = LocalAIClient(http_client=http_client)
+            return await asyncio.gather(
+                client.is_available(),
+                client.list_models(),
+                client.get_fastest_available_model(),
+            )
+
+    is_available, models, fastest = asyncio.run(run_lookups())
+
+    assert tags_requests == ["/api/tags"]
+    assert is_available is True
+    assert models == ["gemma2:2b", "llama3.2:1b"]
+    assert fastest == "llama3.2:1b"
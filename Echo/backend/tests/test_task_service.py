@@ -11,42 +11,37 @@ These tests verify that our TaskService works correctly:
 Think of these as a robot that automatically tests your code!
 """
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
-from app.core.database import Base
+from app.models.task import Task
 from app.services.task_service import TaskService
 from app.schemas.task import TaskCreate, TaskUpdate
 from app.models.enums import TaskStatus, TaskPriority
+from app.core.cache import cache
 
 
-# Create in-memory SQLite database for testing
-TEST_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# One clock read for every test payload, so their due dates agree with
+# each other (each is a day or more away from the service's own now())
+NOW = datetime.now()
 
 
-@pytest.fixture
-def db_session():
+@pytest.fixture(scope="session", autouse=True)
+def warm_query_cache(tables):
     """
-    Create a fresh database for each test
+    Compile the get_all_tasks filter queries once, up front
     
-    This ensures tests don't interfere with each other.
-    Each test gets a clean database to work with.
+    SQLAlchemy caches compiled SQL per engine, so the tests reuse it
+    instead of the first filtering test paying for the compilation.
+    Every xdist worker has its own engine and warms it once.
     """
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Create session
-    session = TestingSessionLocal()
-    
-    try:
-        yield session
-    finally:
-        session.close()
-        # Clean up - drop all tables
-        Base.metadata.drop_all(bind=engine)
+    with Session(bind=tables) as session:
+        task_service = TaskService(session)
+        task_service.get_all_tasks()
+        task_service.get_all_tasks(status=TaskStatus.TODO)
+        task_service.get_all_tasks(priority=TaskPriority.HIGH)
+        task_service.get_all_tasks(status=TaskStatus.TODO, priority=TaskPriority.HIGH)
+        session.rollback()
 
 
 @pytest.fixture
@@ -55,17 +50,23 @@ def task_service(db_session):
     return TaskService(db_session)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_task_data():
-    """Sample task data for testing"""
+    """Sample task data for testing (validated once; tests only read it)"""
     return TaskCreate(
         title="Test Task",
         description="This is a test task",
         priority=TaskPriority.HIGH,
-        due_date=datetime.now() + timedelta(days=1)
+        due_date=NOW + timedelta(days=1)
     )
 
 
+# Read-only task payloads for the statistics test, validated once at import
+COMPLETED_TASK = TaskCreate(title="Completed Task", status=TaskStatus.COMPLETED)
+FUTURE_TASK = TaskCreate(title="Future Task", due_date=NOW + timedelta(days=1))
+OVERDUE_TASK = TaskCreate(title="Overdue Task", due_date=NOW - timedelta(days=1))
+
+
 class TestTaskService:
     """Test class for TaskService functionality"""
     
@@ -114,7 +115,7 @@ class TestTaskService:
         non_existent = task_service.get_task_by_id("non-existent-id")
         assert non_existent is None
     
-    def test_get_all_tasks(self, task_service):
+    def test_get_all_tasks(self, task_service, seed):
         """
         Test getting all tasks with filtering
         
@@ -124,24 +125,13 @@ class TestTaskService:
         - Filters by priority work
         - Pagination works
         """
-        # Create multiple tasks with different properties
-        task1 = task_service.create_task(TaskCreate(
-            title="High Priority Task",
-            priority=TaskPriority.HIGH,
-            status=TaskStatus.TODO
-        ))
-        
-        task2 = task_service.create_task(TaskCreate(
-            title="Completed Task",
-            priority=TaskPriority.MEDIUM,
-            status=TaskStatus.COMPLETED
-        ))
-        
-        task3 = task_service.create_task(TaskCreate(
-            title="Low Priority Task",
-            priority=TaskPriority.LOW,
-            status=TaskStatus.TODO
-        ))
+        # Create multiple tasks with different properties in one go
+        seed(
+            Task,
+            {"title": "High Priority Task", "priority": TaskPriority.HIGH, "status": TaskStatus.TODO},
+            {"title": "Completed Task", "priority": TaskPriority.MEDIUM, "status": TaskStatus.COMPLETED},
+            {"title": "Low Priority Task", "priority": TaskPriority.LOW, "status": TaskStatus.TODO}
+        )
         
         # Test getting all tasks
         all_tasks = task_service.get_all_tasks()
@@ -165,6 +155,20 @@ class TestTaskService:
         
         second_page = task_service.get_all_tasks(limit=2, offset=2)
         assert len(second_page) == 1
+        
+        # The lightweight rows must match the models for every filter
+        for filters, tasks in [
+            ({}, all_tasks),
+            ({"status": TaskStatus.TODO}, todo_tasks),
+            ({"status": TaskStatus.COMPLETED}, completed_tasks),
+            ({"priority": TaskPriority.HIGH}, high_priority),
+        ]:
+            rows = task_service.get_all_tasks_lite(**filters)
+            assert {row.id for row in rows} == {task.id for task in tasks}
+        
+        assert task_service.get_all_tasks_lite(priority=TaskPriority.HIGH)[0].title == "High Priority Task"
+        assert len(task_service.get_all_tasks_lite(limit=2, offset=0)) == 2
+        assert len(task_service.get_all_tasks_lite(limit=2, offset=2)) == 1
     
     def test_update_task(self, task_service, sample_task_data):
         """
@@ -238,24 +242,10 @@ class TestTaskService:
         - Counts are correct
         - Overdue calculation works
         """
-        # Create tasks with different statuses and due dates
-        # Completed task
-        task_service.create_task(TaskCreate(
-            title="Completed Task",
-            status=TaskStatus.COMPLETED
-        ))
-        
-        # Pending task (not overdue)
-        task_service.create_task(TaskCreate(
-            title="Future Task",
-            due_date=datetime.now() + timedelta(days=1)
-        ))
-        
-        # Overdue task
-        task_service.create_task(TaskCreate(
-            title="Overdue Task",
-            due_date=datetime.now() - timedelta(days=1)
-        ))
+        # Create tasks with different statuses and due dates:
+        # completed, pending (not overdue) and overdue
+        for task_data in (COMPLETED_TASK, FUTURE_TASK, OVERDUE_TASK):
+            task_service.create_task(task_data)
         
         # Get statistics
         stats = task_service.get_task_statistics()
@@ -287,12 +277,31 @@ class TestTaskService:
         todo_task = task_service.update_task(task.id, update)
         assert todo_task.completed_at is None
 
+    def test_writes_invalidate_analytics_cache(self, task_service, sample_task_data):
+        """
+        Test that cached analytics never outlive a task change
+
+        Verifies:
+        - Each write bumps the analytics cache version
+        """
+        version = cache.get_version("analytics")
+
+        task = task_service.create_task(sample_task_data)
+        assert cache.get_version("analytics") == version + 1
+
+        task_service.update_task(task.id, TaskUpdate(status=TaskStatus.COMPLETED))
+        assert cache.get_version("analytics") == version + 2
+
+        task_service.delete_task(task.id)
+        assert cache.get_version("analytics") == version + 3
+
 
 # How to run these tests:
 """
 1. Install pytest: pip install pytest
 2. Run tests: pytest tests/test_task_service.py -v
 3. See detailed output with explanations
+4. Run in parallel: pytest -n auto tests/
 
 These tests ensure your TaskService works correctly
 and catches bugs before they reach users!
@@ -0,0 +1,88 @@
+"""
+Benchmarks for the Task Service query paths
+
+These track how fast get_all_tasks answers its filtered and paginated
+queries, so a slower ORM query shows up as a benchmark regression
+instead of a quietly slower test suite.
+
+Needs pytest-benchmark; the module is skipped when it isn't installed.
+A plain `pytest` run skips the benchmarks too, so they never slow down
+the regular suite. Run them explicitly:
+
+1. Install pytest-benchmark: pip install pytest-benchmark
+2. Run: pytest tests/test_task_service_bench.py --benchmark-enable
+   (or --benchmark-only to run nothing but benchmarks)
+3. Compare against a saved run: add --benchmark-autosave --benchmark-compare
+"""
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.task import Task
+from app.services.task_service import TaskService
+from app.models.enums import TaskStatus, TaskPriority
+
+pytest.importorskip("pytest_benchmark")
+
+NUM_TASKS = 1000
+
+STATUSES = list(TaskStatus)
+PRIORITIES = list(TaskPriority)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def benchmarks_requested(request):
+    """Skip the module unless benchmarks were asked for (before any seeding)"""
+    config = request.config
+    if not (config.getoption("benchmark_enable") or config.getoption("benchmark_only")):
+        pytest.skip("benchmarks only run with --benchmark-enable or --benchmark-only")
+
+
+@pytest.fixture(scope="module")
+def task_service():
+    """One TaskService over an in-memory database seeded with NUM_TASKS tasks"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.execute(insert(Task), [
+        {
+            "title": f"Benchmark Task {i}",
+            "status": STATUSES[i % len(STATUSES)],
+            "priority": PRIORITIES[i % len(PRIORITIES)]
+        }
+        for i in range(NUM_TASKS)
+    ])
+    session.commit()
+
+    try:
+        yield TaskService(session)
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_filter_by_status(benchmark, task_service):
+    """Benchmark filtering tasks by status"""
+    tasks = benchmark(task_service.get_all_tasks, status=TaskStatus.TODO)
+    assert tasks and all(task.status == TaskStatus.TODO for task in tasks)
+
+
+def test_filter_by_priority(benchmark, task_service):
+    """Benchmark filtering tasks by priority"""
+    tasks = benchmark(task_service.get_all_tasks, priority=TaskPriority.HIGH)
+    assert tasks and all(task.priority == TaskPriority.HIGH for task in tasks)
+
+
+@pytest.mark.parametrize("offset", [0, NUM_TASKS - 50])
+def test_paginate(benchmark, task_service, offset):
+    """Benchmark reading one page of tasks, from the start and near the end"""
+    tasks = benchmark(task_service.get_all_tasks, limit=50, offset=offset)
+    assert len(tasks) == 50
+
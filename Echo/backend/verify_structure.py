@@ -2,10 +2,70 @@
 Verify the backend structure is set up correctly
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def check_file_exists(filepath):
-    """Check if a file exists and print status"""
-    exists = os.path.exists(filepath)
+# Files every backend checkout needs, grouped by section
+REQUIRED_FILES = {
+    "Core Application Files": [
+        "app/__init__.py",
+        "app/main.py",
+        "app/core/__init__.py",
+        "app/core/config.py",
+        "app/core/database.py",
+        "app/core/init_db.py",
+    ],
+    "Model Files": [
+        "app/models/__init__.py",
+        "app/models/enums.py",
+        "app/models/task.py",
+        "app/models/habit.py",
+        "app/models/chat.py",
+    ],
+    "API Structure": [
+        "app/api/__init__.py",
+        "app/api/v1/__init__.py",
+        "app/api/v1/api.py",
+    ],
+    "Database Migration Files": [
+        "alembic.ini",
+        "alembic/env.py",
+        "alembic/script.py.mako",
+        "alembic/versions/001_initial_migration.py",
+    ],
+    "Configuration and Setup Files": [
+        "requirements.txt",
+        ".env.example",
+        "run.py",
+        "setup_db.py",
+        "README.md",
+    ],
+}
+
+def list_directory(directory):
+    """Return the paths of the entries in a directory (empty if it is missing)"""
+    try:
+        with os.scandir(directory or ".") as entries:
+            return {os.path.join(directory, entry.name) for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+def existing_files(filepaths):
+    """
+    Find which of the given paths exist, listing each parent directory once
+    
+    The listings run on a thread pool (scandir releases the GIL), so on a
+    slow network or FUSE filesystem their latencies overlap.
+    """
+    directories = {os.path.dirname(filepath) for filepath in filepaths}
+    present = set()
+    with ThreadPoolExecutor(max_workers=min(16, len(directories) or 1)) as pool:
+        for listing in pool.map(list_directory, directories):
+            present |= listing
+    return present
+
+def check_file_exists(filepath, present):
+    """Print whether a file is present and return it"""
+    exists = filepath in present
     status = "✅" if exists else "❌"
     print(f"{status} {filepath}")
     return exists
@@ -14,39 +74,17 @@ def verify_backend_structure():
     """Verify all required files are in place"""
     print("Verifying ECHO backend structure...\n")
     
-    # Core files
-    print("Core Application Files:")
-    check_file_exists("app/__init__.py")
-    check_file_exists("app/main.py")
-    check_file_exists("app/core/__init__.py")
-    check_file_exists("app/core/config.py")
-    check_file_exists("app/core/database.py")
-    check_file_exists("app/core/init_db.py")
-    
-    print("\nModel Files:")
-    check_file_exists("app/models/__init__.py")
-    check_file_exists("app/models/enums.py")
-    check_file_exists("app/models/task.py")
-    check_file_exists("app/models/habit.py")
-    check_file_exists("app/models/chat.py")
-    
-    print("\nAPI Structure:")
-    check_file_exists("app/api/__init__.py")
-    check_file_exists("app/api/v1/__init__.py")
-    check_file_exists("app/api/v1/api.py")
-    
-    print("\nDatabase Migration Files:")
-    check_file_exists("alembic.ini")
-    check_file_exists("alembic/env.py")
-    check_file_exists("alembic/script.py.mako")
-    check_file_exists("alembic/versions/001_initial_migration.py")
+    # One directory listing per folder instead of one stat() per file
+    present = existing_files(
+        [filepath for filepaths in REQUIRED_FILES.values() for filepath in filepaths]
+    )
     
-    print("\nConfiguration and Setup Files:")
-    check_file_exists("requirements.txt")
-    check_file_exists(".env.example")
-    check_file_exists("run.py")
-    check_file_exists("setup_db.py")
-    check_file_exists("README.md")
+    for index, (section, filepaths) in enumerate(REQUIRED_FILES.items()):
+        if index:
+            print()
+        print(f"{section}:")
+        for filepath in filepaths:
+            check_file_exists(filepath, present)
     
     print("\n✅ Backend foundation structure is complete!")
     print("\nNext steps:")